@@ -36,6 +36,8 @@ def format_board(board: Optional[List[str]]) -> str:
 
 
 def safe_float(v: Any) -> Optional[float]:
+    if type(v) is float:
+        return v
     if isinstance(v, (int, float)):
         return float(v)
     return None
@@ -17,6 +17,8 @@ def load_hands(path: Path) -> List[Dict[str, Any]]:
 
 
 def safe_float(v: Any) -> Optional[float]:
+    if type(v) is float:
+        return v
     if isinstance(v, (int, float)):
         return float(v)
     return None
@@ -1,7 +1,11 @@
 import json
+from collections import Counter
 from pathlib import Path
 from typing import Any, Dict, List
 
+# наборы типов действий общие с сессионным отчётом — берём оттуда, а не копируем
+from session_summary import AGGR_TYPES, CBET_TYPES, FOLD_TYPES, PASSIVE_TYPES, PRE_AGGR
+
 
 # ==========================
 #   ЗАГРУЗКА РАЗДАЧ
@@ -29,7 +33,7 @@ def is_hero_aggressor_preflop(hand: Dict[str, Any]) -> bool:
         return False
 
     atype = hero_preflop_analysis.get("action_type")
-    if atype in ("open_raise", "iso_raise", "3bet", "4bet", "5bet_plus"):
+    if atype in PRE_AGGR:
         return True
     return False
 
@@ -49,8 +53,8 @@ def analyze_flop(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     total_with_flop = 0
 
-    quality_counts: Dict[str, int] = {}
-    action_type_counts: Dict[str, int] = {}
+    quality_counts: Counter = Counter()
+    action_type_counts: Counter = Counter()
 
     cbet_spots = 0
     cbet_made = 0
@@ -70,7 +74,7 @@ def analyze_flop(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- decision_quality ---
         dq = hero_flop_decision.get("decision_quality") or "unknown"
-        quality_counts[dq] = quality_counts.get(dq, 0) + 1
+        quality_counts[dq] += 1
 
         if dq not in example_hands_by_quality:
             example_hands_by_quality[dq] = []
@@ -80,7 +84,7 @@ def analyze_flop(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- action_type ---
         atype = hero_flop_decision.get("action_type") or "unknown"
-        action_type_counts[atype] = action_type_counts.get(atype, 0) + 1
+        action_type_counts[atype] += 1
 
         # --- c-bet дисциплина ---
         # герой префлоп-агрессор + дошли до флопа → это c-bet спот
@@ -88,7 +92,7 @@ def analyze_flop(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
             cbet_spots += 1
 
             # c-bet считаем, если герой ставит/рейзит на флопе
-            is_cbet = atype in ("bet_vs_check", "raise_vs_bet", "bet", "raise", "cbet")
+            is_cbet = atype in CBET_TYPES
             is_check = atype == "check"
 
             if is_cbet:
@@ -130,7 +134,7 @@ def print_flop_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(quality_counts.keys()):
             cnt = quality_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:7s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -141,7 +145,7 @@ def print_flop_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(action_type_counts.keys()):
             cnt = action_type_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:15s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -183,9 +187,9 @@ def analyze_turn(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     total_with_turn = 0
 
-    quality_counts: Dict[str, int] = {}
-    action_type_counts: Dict[str, int] = {}
-    impact_counts: Dict[str, int] = {}
+    quality_counts: Counter = Counter()
+    action_type_counts: Counter = Counter()
+    impact_counts: Counter = Counter()
 
     aggressive_count = 0
     passive_count = 0
@@ -204,7 +208,7 @@ def analyze_turn(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- decision_quality ---
         dq = hero_turn_decision.get("decision_quality") or "unknown"
-        quality_counts[dq] = quality_counts.get(dq, 0) + 1
+        quality_counts[dq] += 1
 
         if dq not in example_hands_by_quality:
             example_hands_by_quality[dq] = []
@@ -213,7 +217,7 @@ def analyze_turn(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- action_type ---
         atype = hero_turn_decision.get("action_type") or "unknown"
-        action_type_counts[atype] = action_type_counts.get(atype, 0) + 1
+        action_type_counts[atype] += 1
 
         # --- impact_on_equity (по текстуре борда) ---
         hand_block = hero_turn_decision.get("hand") or {}
@@ -221,14 +225,14 @@ def analyze_turn(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
         impact = board_texture.get("impact_on_equity")
         if impact is None:
             impact = "unknown"
-        impact_counts[impact] = impact_counts.get(impact, 0) + 1
+        impact_counts[impact] += 1
 
         # --- дисциплина агрессии ---
-        if atype in ("bet_vs_check", "bet", "raise_vs_bet", "raise"):
+        if atype in AGGR_TYPES:
             aggressive_count += 1
-        elif atype in ("check", "call_vs_bet", "call"):
+        elif atype in PASSIVE_TYPES:
             passive_count += 1
-        elif atype in ("fold_vs_bet", "fold"):
+        elif atype in FOLD_TYPES:
             fold_count += 1
 
     return {
@@ -266,7 +270,7 @@ def print_turn_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(quality_counts.keys()):
             cnt = quality_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:7s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -277,7 +281,7 @@ def print_turn_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(action_type_counts.keys()):
             cnt = action_type_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:15s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -288,7 +292,7 @@ def print_turn_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(impact_counts.keys()):
             cnt = impact_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:8s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -333,14 +337,14 @@ def analyze_river(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     total_with_river = 0
 
-    quality_counts: Dict[str, int] = {}
-    action_type_counts: Dict[str, int] = {}
+    quality_counts: Counter = Counter()
+    action_type_counts: Counter = Counter()
 
     aggressive_count = 0
     passive_count = 0
     fold_count = 0
 
-    equity_bucket_counts: Dict[str, int] = {}
+    equity_bucket_counts: Counter = Counter()
 
     example_hands_by_quality: Dict[str, List[str]] = {}
 
@@ -358,7 +362,7 @@ def analyze_river(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- decision_quality ---
         dq = hero_river_decision.get("decision_quality") or "unknown"
-        quality_counts[dq] = quality_counts.get(dq, 0) + 1
+        quality_counts[dq] += 1
 
         if dq not in example_hands_by_quality:
             example_hands_by_quality[dq] = []
@@ -367,14 +371,14 @@ def analyze_river(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
 
         # --- action_type ---
         atype = hero_river_decision.get("action_type") or "unknown"
-        action_type_counts[atype] = action_type_counts.get(atype, 0) + 1
+        action_type_counts[atype] += 1
 
         # --- дисциплина агрессии ---
-        if atype in ("bet_vs_check", "bet", "raise_vs_bet", "raise"):
+        if atype in AGGR_TYPES:
             aggressive_count += 1
-        elif atype in ("check", "call_vs_bet", "call"):
+        elif atype in PASSIVE_TYPES:
             passive_count += 1
-        elif atype in ("fold_vs_bet", "fold"):
+        elif atype in FOLD_TYPES:
             fold_count += 1
 
         # --- equity buckets ---
@@ -392,13 +396,13 @@ def analyze_river(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
             else:
                 eq_bucket = "high(>0.60)"
 
-        equity_bucket_counts[eq_bucket] = equity_bucket_counts.get(eq_bucket, 0) + 1
+        equity_bucket_counts[eq_bucket] += 1
 
         # --- missed value spot: высокая equity, но чек ---
         # v1-логика: если estimated_equity >= 0.70 и герой играет check → флаг как потенциально упущенное вэлью.
         if numeric_eq is not None and numeric_eq >= 0.70 and atype == "check":
             missed_value_count += 1
-            if len(missed_value_hands) < 20:
+            if missed_value_count <= 20:
                 missed_value_hands.append(hand_id)
 
     return {
@@ -439,7 +443,7 @@ def print_river_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(quality_counts.keys()):
             cnt = quality_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:7s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -450,7 +454,7 @@ def print_river_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(action_type_counts.keys()):
             cnt = action_type_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:15s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -473,7 +477,7 @@ def print_river_report(stats: Dict[str, Any]) -> None:
     else:
         for key in sorted(equity_bucket_counts.keys()):
             cnt = equity_bucket_counts[key]
-            pct = cnt / total * 100 if total > 0 else 0.0
+            pct = cnt / total * 100
             print(f"  - {key:18s}: {cnt:3d} раз ({pct:5.1f}%)")
     print()
 
@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 POSITIONS = ["UTG", "MP", "HJ", "CO", "BTN", "SB", "BB"]
+_POSITION_INDEX = {pos: i for i, pos in enumerate(POSITIONS)}
 
 
 def load_hands(json_path: str) -> List[Dict[str, Any]]:
@@ -22,9 +23,11 @@ def load_hands(json_path: str) -> List[Dict[str, Any]]:
 
 
 def _safe_float(x: Any) -> Optional[float]:
+    if type(x) is float:
+        return x
+    if x is None:
+        return None
     try:
-        if x is None:
-            return None
         return float(x)
     except (TypeError, ValueError):
         return None
@@ -58,12 +61,12 @@ def classify_range_errors(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
         "total_rfi_opportunities": 0,   # сколько раз у героя был шанс действовать первым (open/fold)
         "total_rfi_errors": 0,          # сколько из них были ошибками по RFI
 
-        # Дисциплина по позициям
-        "positions": {
-            pos: {"opportunities": 0, "errors": 0}
-            for pos in POSITIONS
-        },
+        # Дисциплина по позициям: параллельные списки в порядке POSITIONS
+        "position_opportunities": [0] * len(POSITIONS),
+        "position_errors": [0] * len(POSITIONS),
     }
+    pos_opps: List[int] = stats["position_opportunities"]
+    pos_errs: List[int] = stats["position_errors"]
 
     # Вспомогательная функция: учесть, что в этом хенде у героя был RFI-спот
     def register_rfi_opportunity(hero_position: Optional[str], is_error: bool):
@@ -71,11 +74,11 @@ def classify_range_errors(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
         if is_error:
             stats["total_rfi_errors"] += 1
 
-        pos = (hero_position or "").upper()
-        if pos in stats["positions"]:
-            stats["positions"][pos]["opportunities"] += 1
+        idx = _POSITION_INDEX.get((hero_position or "").upper())
+        if idx is not None:
+            pos_opps[idx] += 1
             if is_error:
-                stats["positions"][pos]["errors"] += 1
+                pos_errs[idx] += 1
 
     # Типы действий, которые считаем "RFI-контекстом" при игре первым
     RFI_ACTION_TYPES = {
@@ -169,6 +172,12 @@ def classify_range_errors(hands: List[Dict[str, Any]]) -> Dict[str, Any]:
                     "comment": rd.get("range_comment"),
                 })
 
+    # Совместимый вид {pos: {"opportunities", "errors"}} для внешних потребителей
+    stats["positions"] = {
+        pos: {"opportunities": o, "errors": e}
+        for pos, o, e in zip(POSITIONS, pos_opps, pos_errs)
+    }
+
     return stats
 
 
@@ -203,10 +212,7 @@ def print_report(stats: Dict[str, Any]) -> None:
 
     # --- Дисциплина по позициям ---
     print("Дисциплина по позициям (только RFI-споты):")
-    for pos in POSITIONS:
-        pstat = stats["positions"][pos]
-        p_opp = pstat["opportunities"]
-        p_err = pstat["errors"]
+    for pos, p_opp, p_err in zip(POSITIONS, stats["position_opportunities"], stats["position_errors"]):
         if p_opp == 0:
             print(f"  {pos}:  нет данных")
         else:
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import heapq
 import json
+import sys
+from array import array
+from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -10,20 +14,24 @@ HANDS_JSON = ROOT / "hands.json"
 
 STREETS = ["preflop", "flop", "turn", "river"]
 
+# ключи legacy-схемы hands.json (hero_<street>_decision) — собираем один раз, а не f-строкой на каждый вызов
+_LEGACY_DECISION_KEYS: Dict[str, str] = {s: f"hero_{s}_decision" for s in STREETS}
+
 
 def _safe_float(x: Any) -> Optional[float]:
+    if type(x) is float:
+        return x
+    if x is None:
+        return None
     try:
-        if x is None:
-            return None
         return float(x)
     except Exception:
         return None
 
 
 def _get_decision(hand: Dict[str, Any], street: str) -> Optional[Dict[str, Any]]:
-    # legacy
-    key = f"hero_{street}_decision"
-    dec = hand.get(key)
+    # legacy (основная схема hands.json от main.py) — проверяем первой
+    dec = hand.get(_LEGACY_DECISION_KEYS[street])
     if isinstance(dec, dict):
         return dec
 
@@ -46,9 +54,7 @@ def _get_decision(hand: Dict[str, Any], street: str) -> Optional[Dict[str, Any]]
     return None
 
 
-def _get_ev_action(decision: Any) -> Optional[float]:
-    if not isinstance(decision, dict):
-        return None
+def _get_ev_action(decision: Dict[str, Any]) -> Optional[float]:
     ev = decision.get("ev_estimate")
     if not isinstance(ev, dict):
         return None
@@ -63,15 +69,12 @@ def _get_ev_action(decision: Any) -> Optional[float]:
     return _safe_float(ev.get("ev"))
 
 
-def _get_missed_value_ev(decision: Any) -> float:
+def _get_missed_value_ev(decision: Dict[str, Any]) -> float:
     """
     Missed value может лежать:
       1) decision["missed_value"]["missed_value_ev"]
       2) decision["ev_estimate"]["missed_value_ev"]
     """
-    if not isinstance(decision, dict):
-        return 0.0
-
     mv = decision.get("missed_value")
     if isinstance(mv, dict):
         v = _safe_float(mv.get("missed_value_ev"))
@@ -87,9 +90,7 @@ def _get_missed_value_ev(decision: Any) -> float:
     return 0.0
 
 
-def _street_action_type(decision: Any) -> str:
-    if not isinstance(decision, dict):
-        return "none"
+def _street_action_type(decision: Dict[str, Any]) -> str:
     return str(decision.get("action_type") or "unknown")
 
 
@@ -98,9 +99,12 @@ def _hand_label(hand: Dict[str, Any], idx: int) -> str:
 
 
 def load_hands() -> List[Dict[str, Any]]:
-    if not HANDS_JSON.exists():
-        raise FileNotFoundError(f"hands.json not found at: {HANDS_JSON}")
-    return json.loads(HANDS_JSON.read_text(encoding="utf-8"))
+    # один open вместо exists() + read_text(): меньше syscall'ов и нет гонки между проверкой и чтением
+    try:
+        text = HANDS_JSON.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"hands.json not found at: {HANDS_JSON}") from None
+    return json.loads(text)
 
 
 def main() -> None:
@@ -110,17 +114,21 @@ def main() -> None:
     street_totals: Dict[str, float] = {s: 0.0 for s in STREETS}
     street_counts: Dict[str, int] = {s: 0 for s in STREETS}
 
-    action_type_counts: Dict[str, Dict[str, int]] = {s: {} for s in STREETS}
-    action_type_ev: Dict[str, Dict[str, float]] = {s: {} for s in STREETS}
+    # action_type копим списком и считаем одним Counter(...) в конце (подсчёт идёт в C)
+    action_types_seen: Dict[str, List[str]] = {s: [] for s in STREETS}
+    action_type_ev: Dict[str, Dict[str, float]] = {s: defaultdict(float) for s in STREETS}
 
     per_hand_ev: List[Tuple[float, str]] = []
-    per_hand_street_ev: Dict[str, List[Tuple[float, str]]] = {s: [] for s in STREETS}
+    # per-street EV хранится как параллельные массивы (значения + hand_id), без кортежа на решение
+    per_hand_street_ev_vals: Dict[str, array] = {s: array("d") for s in STREETS}
+    per_hand_street_ev_ids: Dict[str, List[str]] = {s: [] for s in STREETS}
 
     # Missed value aggregation
     missed_totals: Dict[str, float] = {s: 0.0 for s in STREETS}
     missed_counts: Dict[str, int] = {s: 0 for s in STREETS}
     per_hand_missed: List[Tuple[float, str]] = []  # (missed_ev_total, hand_id)
-    per_hand_street_missed: Dict[str, List[Tuple[float, str]]] = {s: [] for s in STREETS}
+    per_hand_street_missed_vals: Dict[str, array] = {s: array("d") for s in STREETS}
+    per_hand_street_missed_ids: Dict[str, List[str]] = {s: [] for s in STREETS}
 
     for idx, hand in enumerate(hands, start=1):
         hand_id = _hand_label(hand, idx)
@@ -130,6 +138,9 @@ def main() -> None:
 
         for street in STREETS:
             decision = _get_decision(hand, street)
+            # _get_decision отдаёт dict или None — дальше хелперы не перепроверяют тип
+            if decision is None:
+                continue
 
             ev = _get_ev_action(decision)
             if ev is not None:
@@ -138,123 +149,130 @@ def main() -> None:
                 hand_total_ev += ev
 
                 at = _street_action_type(decision)
-                action_type_counts[street][at] = action_type_counts[street].get(at, 0) + 1
-                action_type_ev[street][at] = action_type_ev[street].get(at, 0.0) + ev
+                action_types_seen[street].append(at)
+                action_type_ev[street][at] += ev
 
-                per_hand_street_ev[street].append((ev, hand_id))
+                per_hand_street_ev_vals[street].append(ev)
+                per_hand_street_ev_ids[street].append(hand_id)
 
             mv_ev = _get_missed_value_ev(decision)
             if mv_ev > 0:
                 missed_totals[street] += mv_ev
                 missed_counts[street] += 1
                 hand_total_missed += mv_ev
-                per_hand_street_missed[street].append((mv_ev, hand_id))
+                per_hand_street_missed_vals[street].append(mv_ev)
+                per_hand_street_missed_ids[street].append(hand_id)
 
         per_hand_ev.append((hand_total_ev, hand_id))
         per_hand_missed.append((hand_total_missed, hand_id))
 
+    action_type_counts: Dict[str, Counter] = {s: Counter(action_types_seen[s]) for s in STREETS}
+
     total_ev = sum(street_totals.values())
     avg_ev_per_hand = total_ev / total_hands if total_hands else 0.0
 
     total_missed = sum(missed_totals.values())
     avg_missed_per_hand = total_missed / total_hands if total_hands else 0.0
 
-    print("========== SESSION EV OVERVIEW ==========")
-    print(f"Hands in file: {total_hands}")
-    print(f"Total EV (sum of ev_action across streets): {total_ev:.4f}")
-    print(f"Average EV per hand: {avg_ev_per_hand:.6f}")
-    print()
+    # отчёт копим построчно и выводим одним write — дешевле, чем сотни print() при выводе в pipe/файл
+    out: List[str] = []
+    w = out.append
 
-    print("=== EV BY STREET ===")
+    w("========== SESSION EV OVERVIEW ==========")
+    w(f"Hands in file: {total_hands}")
+    w(f"Total EV (sum of ev_action across streets): {total_ev:.4f}")
+    w(f"Average EV per hand: {avg_ev_per_hand:.6f}")
+    w("")
+
+    w("=== EV BY STREET ===")
     for street in STREETS:
         cnt = street_counts[street]
         tot = street_totals[street]
         avg = (tot / cnt) if cnt else 0.0
-        print(f"- {street:7s}: total_ev={tot:.4f} | decisions={cnt} | avg_ev/decision={avg:.6f}")
-    print()
+        w(f"- {street:7s}: total_ev={tot:.4f} | decisions={cnt} | avg_ev/decision={avg:.6f}")
+    w("")
 
-    print("=== MISSED VALUE EV (Iteration 2) ===")
-    print(f"Total Missed EV: {total_missed:.4f}")
-    print(f"Average Missed EV per hand: {avg_missed_per_hand:.6f}")
+    w("=== MISSED VALUE EV (Iteration 2) ===")
+    w(f"Total Missed EV: {total_missed:.4f}")
+    w(f"Average Missed EV per hand: {avg_missed_per_hand:.6f}")
     for street in STREETS:
         cnt = missed_counts[street]
         tot = missed_totals[street]
         avg = (tot / cnt) if cnt else 0.0
-        print(f"- {street:7s}: missed_total={tot:.4f} | spots={cnt} | avg_missed/spot={avg:.6f}")
-    print()
+        w(f"- {street:7s}: missed_total={tot:.4f} | spots={cnt} | avg_missed/spot={avg:.6f}")
+    w("")
 
-    print("=== TOP HANDS BY EV (TOTAL) ===")
-    per_hand_ev_sorted = sorted(per_hand_ev, key=lambda x: x[0])
-    worst = per_hand_ev_sorted[:5]
-    best = list(reversed(per_hand_ev_sorted[-5:]))
+    w("=== TOP HANDS BY EV (TOTAL) ===")
+    worst = heapq.nsmallest(5, per_hand_ev, key=lambda x: x[0])
+    best = heapq.nlargest(5, per_hand_ev, key=lambda x: x[0])
 
-    print("Worst 5:")
+    w("Worst 5:")
     for ev, hid in worst:
-        print(f"  - {hid}: {ev:.4f}")
+        w(f"  - {hid}: {ev:.4f}")
 
-    print("Best 5:")
+    w("Best 5:")
     for ev, hid in best:
-        print(f"  - {hid}: {ev:.4f}")
-    print()
+        w(f"  - {hid}: {ev:.4f}")
+    w("")
 
-    print("=== TOP HANDS BY MISSED VALUE EV (TOTAL) ===")
-    per_hand_missed_sorted = sorted(per_hand_missed, key=lambda x: x[0])
-    worst_missed = list(reversed(per_hand_missed_sorted[-5:]))  # biggest missed
-    print("Biggest missed 5:")
+    w("=== TOP HANDS BY MISSED VALUE EV (TOTAL) ===")
+    worst_missed = heapq.nlargest(5, per_hand_missed, key=lambda x: x[0])  # biggest missed
+    w("Biggest missed 5:")
     for mv, hid in worst_missed:
-        print(f"  - {hid}: {mv:.4f}")
-    print()
+        w(f"  - {hid}: {mv:.4f}")
+    w("")
 
-    print("=== TOP HANDS BY EV (PER STREET) ===")
+    w("=== TOP HANDS BY EV (PER STREET) ===")
     for street in STREETS:
-        items = per_hand_street_ev[street]
-        if not items:
-            print(f"- {street}: no decisions with ev_estimate")
+        vals = per_hand_street_ev_vals[street]
+        ids = per_hand_street_ev_ids[street]
+        if not vals:
+            w(f"- {street}: no decisions with ev_estimate")
             continue
-        items_sorted = sorted(items, key=lambda x: x[0])
-        worst_s = items_sorted[:3]
-        best_s = list(reversed(items_sorted[-3:]))
-
-        print(f"- {street.upper()}:")
-        print("    Worst 3:")
-        for ev, hid in worst_s:
-            print(f"      * {hid}: {ev:.4f}")
-        print("    Best 3:")
-        for ev, hid in best_s:
-            print(f"      * {hid}: {ev:.4f}")
-    print()
-
-    print("=== TOP MISSED VALUE EV (PER STREET) ===")
+        worst_s = heapq.nsmallest(3, range(len(vals)), key=vals.__getitem__)
+        best_s = heapq.nlargest(3, range(len(vals)), key=vals.__getitem__)
+
+        w(f"- {street.upper()}:")
+        w("    Worst 3:")
+        for i in worst_s:
+            w(f"      * {ids[i]}: {vals[i]:.4f}")
+        w("    Best 3:")
+        for i in best_s:
+            w(f"      * {ids[i]}: {vals[i]:.4f}")
+    w("")
+
+    w("=== TOP MISSED VALUE EV (PER STREET) ===")
     for street in STREETS:
-        items = per_hand_street_missed[street]
-        if not items:
-            print(f"- {street}: no missed value spots")
+        vals = per_hand_street_missed_vals[street]
+        ids = per_hand_street_missed_ids[street]
+        if not vals:
+            w(f"- {street}: no missed value spots")
             continue
-        items_sorted = sorted(items, key=lambda x: x[0])
-        best_s = list(reversed(items_sorted[-3:]))
+        best_s = heapq.nlargest(3, range(len(vals)), key=vals.__getitem__)
 
-        print(f"- {street.upper()}:")
-        print("    Biggest missed 3:")
-        for mv, hid in best_s:
-            print(f"      * {hid}: {mv:.4f}")
-    print()
+        w(f"- {street.upper()}:")
+        w("    Biggest missed 3:")
+        for i in best_s:
+            w(f"      * {ids[i]}: {vals[i]:.4f}")
+    w("")
 
-    print("=== ACTION TYPES (COUNT + EV) ===")
+    w("=== ACTION TYPES (COUNT + EV) ===")
     for street in STREETS:
-        print(f"- {street.upper()}:")
+        w(f"- {street.upper()}:")
         counts = action_type_counts[street]
         evs = action_type_ev[street]
         if not counts:
-            print("    (no data)")
+            w("    (no data)")
             continue
-        rows = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)
-        for at, c in rows:
+        for at, c in counts.most_common():
             tot_ev = evs.get(at, 0.0)
             avg = tot_ev / c if c else 0.0
-            print(f"    {at:18s} | n={c:3d} | total_ev={tot_ev:.4f} | avg_ev={avg:.6f}")
+            w(f"    {at:18s} | n={c:3d} | total_ev={tot_ev:.4f} | avg_ev={avg:.6f}")
+
+    w("")
+    w("============= SESSION EV OVERVIEW DONE =============")
 
-    print()
-    print("============= SESSION EV OVERVIEW DONE =============")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
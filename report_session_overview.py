@@ -12,9 +12,11 @@ def _load_json(path: str) -> Any:
 
 
 def _to_float(x: Any, default: float = 0.0) -> float:
+    if type(x) is float:
+        return x
+    if x is None:
+        return default
     try:
-        if x is None:
-            return default
         return float(x)
     except (TypeError, ValueError):
         return default
@@ -53,8 +55,7 @@ def _normalize_ev_estimate(ev_est: Any) -> Dict[str, Any]:
     out["ev_action"] = float(ev_num)
     out["ev_action_label"] = label
     out["model"] = model
-    if "ev" in out:
-        out.pop("ev", None)
+    out.pop("ev", None)
     return out
 
 
@@ -159,45 +160,51 @@ def main() -> None:
     n_hands = len(hands)
     ev_avg = {k: (v / n_hands) for k, v in ev_sum.items()}
 
-    print("=" * 72)
-    print("SESSION OVERVIEW (Iteration 1)")
-    print(f"Hands: {n_hands}")
-    print(f"Street decisions counted: {decisions_count}")
-    print("=" * 72)
-
-    print()
-    print("=== EV SUM ===")
-    print(f"EV(preflop): {_signed(ev_sum['preflop'])}")
-    print(f"EV(flop):    {_signed(ev_sum['flop'])}")
-    print(f"EV(turn):    {_signed(ev_sum['turn'])}")
-    print(f"EV(river):   {_signed(ev_sum['river'])}")
-    print("-" * 26)
-    print(f"EV(total):   {_signed(ev_sum['total'])}")
-
-    print()
-    print("=== EV AVG PER HAND ===")
-    print(f"EV/preflop: {_signed(ev_avg['preflop'])}")
-    print(f"EV/flop:    {_signed(ev_avg['flop'])}")
-    print(f"EV/turn:    {_signed(ev_avg['turn'])}")
-    print(f"EV/river:   {_signed(ev_avg['river'])}")
-    print("-" * 26)
-    print(f"EV/hand:    {_signed(ev_avg['total'])}")
-
-    print()
-    print("=== DECISION QUALITY (street-level counts) ===")
+    # отчёт копим построчно и выводим одним write — дешевле, чем десятки print() при выводе в pipe/файл
+    out: List[str] = []
+    w = out.append
+
+    w("=" * 72)
+    w("SESSION OVERVIEW (Iteration 1)")
+    w(f"Hands: {n_hands}")
+    w(f"Street decisions counted: {decisions_count}")
+    w("=" * 72)
+
+    w("")
+    w("=== EV SUM ===")
+    w(f"EV(preflop): {_signed(ev_sum['preflop'])}")
+    w(f"EV(flop):    {_signed(ev_sum['flop'])}")
+    w(f"EV(turn):    {_signed(ev_sum['turn'])}")
+    w(f"EV(river):   {_signed(ev_sum['river'])}")
+    w("-" * 26)
+    w(f"EV(total):   {_signed(ev_sum['total'])}")
+
+    w("")
+    w("=== EV AVG PER HAND ===")
+    w(f"EV/preflop: {_signed(ev_avg['preflop'])}")
+    w(f"EV/flop:    {_signed(ev_avg['flop'])}")
+    w(f"EV/turn:    {_signed(ev_avg['turn'])}")
+    w(f"EV/river:   {_signed(ev_avg['river'])}")
+    w("-" * 26)
+    w(f"EV/hand:    {_signed(ev_avg['total'])}")
+
+    w("")
+    w("=== DECISION QUALITY (street-level counts) ===")
     for k in ("good", "marginal", "mistake", "blunder", "unknown"):
-        print(f"{k.rjust(8)}: {dq_counts.get(k, 0)}")
+        w(f"{k.rjust(8)}: {dq_counts[k]}")
 
-    print()
-    print("=== EV=0 COUNTS (by street, number of hands) ===")
+    w("")
+    w("=== EV=0 COUNTS (by street, number of hands) ===")
     # тут счётчик по рукам, не по решениям: “в скольких руках на улице EV был 0”
-    print(f"preflop: {ev_zero_counts['preflop']} / {n_hands}")
-    print(f"flop:    {ev_zero_counts['flop']} / {n_hands}")
-    print(f"turn:    {ev_zero_counts['turn']} / {n_hands}")
-    print(f"river:   {ev_zero_counts['river']} / {n_hands}")
+    w(f"preflop: {ev_zero_counts['preflop']} / {n_hands}")
+    w(f"flop:    {ev_zero_counts['flop']} / {n_hands}")
+    w(f"turn:    {ev_zero_counts['turn']} / {n_hands}")
+    w(f"river:   {ev_zero_counts['river']} / {n_hands}")
+
+    w("")
+    w("OK")
 
-    print()
-    print("OK")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,14 +1,22 @@
 import json
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:
+    import ijson  # потоковый парсер (опционально)
+except ImportError:
+    ijson = None
 
 
 def load_hands(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        raise FileNotFoundError(f"Файл {path} не найден. Сначала запусти main.py, чтобы создать hands.json")
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл {path} не найден. Сначала запусти main.py, чтобы создать hands.json") from None
 
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = json.loads(raw)
 
     if not isinstance(data, list):
         raise ValueError("Ожидался список раздач (list) в hands.json")
@@ -16,128 +24,131 @@ def load_hands(path: Path) -> List[Dict[str, Any]]:
     return data
 
 
-def collect_quality_counts(hands: List[Dict[str, Any]], key: str) -> Tuple[int, Dict[str, int]]:
+def iter_hands(path: Path) -> Iterator[Dict[str, Any]]:
     """
-    Собираем распределение decision_quality для блока hero_*_decision.
-    key: "hero_preflop_decision", "hero_flop_decision", "hero_turn_decision", "hero_river_decision"
+    Отдаёт раздачи из hands.json по одной.
+    С ijson файл парсится потоково (в памяти одна раздача),
+    без него — fallback на load_hands.
     """
-    total = 0
-    counts: Dict[str, int] = {}
-
-    for hand in hands:
-        block = hand.get(key)
-        if not isinstance(block, dict):
-            continue
-        dq = block.get("decision_quality") or "unknown"
-        total += 1
-        counts[dq] = counts.get(dq, 0) + 1
-
-    return total, counts
-
+    if ijson is None:
+        yield from load_hands(path)
+        return
 
-def compute_cbet_stats(hands: List[Dict[str, Any]]) -> Tuple[int, int, int]:
-    """
-    Считаем дисциплину c-bet на флопе.
-    """
-    total_spots = 0
-    cbet_made = 0
-    cbet_missed = 0
+    try:
+        f = path.open("rb")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл {path} не найден. Сначала запусти main.py, чтобы создать hands.json") from None
 
-    for hand in hands:
-        hero_pre = hand.get("hero_preflop_analysis") or {}
-        atype_pre = hero_pre.get("action_type")
-        is_aggressor = atype_pre in ("open_raise", "iso_raise", "3bet", "4bet", "5bet_plus")
+    with f:
+        yield from ijson.items(f, "item", use_float=True)
 
-        hero_flop = hand.get("hero_flop_decision") or {}
-        if not hero_flop:
-            continue
 
-        if not is_aggressor:
-            continue
+# Типы действий для классификации линий (frozenset — O(1) membership вместо скана кортежа)
+PRE_AGGR = frozenset({"open_raise", "iso_raise", "3bet", "4bet", "5bet_plus"})
+CBET_TYPES = frozenset({"bet_vs_check", "raise_vs_bet", "bet", "raise", "cbet"})
+AGGR_TYPES = frozenset({"bet_vs_check", "bet", "raise_vs_bet", "raise"})
+PASSIVE_TYPES = frozenset({"check", "call_vs_bet", "call"})
+FOLD_TYPES = frozenset({"fold_vs_bet", "fold"})
 
-        total_spots += 1
-        atype = hero_flop.get("action_type") or "unknown"
+_EMPTY: Dict[str, Any] = {}
 
-        is_cbet = atype in ("bet_vs_check", "raise_vs_bet", "bet", "raise", "cbet")
-        is_check = atype == "check"
+# Сколько примеров missed value спотов сохраняем для отчёта
+MISSED_IDS_CAP = 20
 
-        if is_cbet:
-            cbet_made += 1
-        elif is_check:
-            cbet_missed += 1
+QUALITY_KEYS = ("hero_preflop_decision", "hero_flop_decision", "hero_turn_decision", "hero_river_decision")
 
-    return total_spots, cbet_made, cbet_missed
 
+def _count_in(counts: Counter, types: frozenset) -> int:
+    return sum(counts[t] for t in types)
 
-def compute_turn_aggression(hands: List[Dict[str, Any]]) -> Tuple[int, int, int]:
-    """
-    Считаем агрессию на тёрне:
-      - агрессивные (bet/raise)
-      - пассивные (check/call)
-      - фолды против ставки
-    """
-    total = 0
-    aggr = 0
-    passive = 0
-    folds = 0
 
-    for hand in hands:
-        hero_turn = hand.get("hero_turn_decision") or {}
-        if not hero_turn:
-            continue
-        total += 1
-        atype = hero_turn.get("action_type") or "unknown"
-        if atype in ("bet_vs_check", "bet", "raise_vs_bet", "raise"):
-            aggr += 1
-        elif atype in ("check", "call_vs_bet", "call"):
-            passive += 1
-        elif atype in ("fold_vs_bet", "fold"):
-            folds += 1
-
-    return total, aggr, passive, folds
-
-
-def compute_river_aggression_and_missed_value(hands: List[Dict[str, Any]]) -> Tuple[int, int, int, int, int, List[str]]:
+def compute_all_session_stats(hands: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Считаем:
-      - агрессию на ривере
-      - потенциальные missed value spots (высокая equity + чек)
+    Вся сессионная статистика за ОДИН проход по рукам:
+      - распределение decision_quality по улицам
+      - дисциплина c-bet на флопе
+      - агрессия на тёрне
+      - агрессия на ривере + потенциальные missed value spots
+
+    Проход только проецирует руки в плоские колонки (списки строк),
+    а подсчёт делается через Counter(колонка) — цикл счёта идёт в C,
+    классификация по типам действий — по уже свёрнутым счётчикам.
     """
-    total = 0
-    aggr = 0
-    passive = 0
-    folds = 0
+    dq_cols: Dict[str, List[str]] = {key: [] for key in QUALITY_KEYS}
+    cbet_col: List[str] = []
+    turn_col: List[str] = []
+    river_col: List[str] = []
     missed_value = 0
     missed_ids: List[str] = []
+    total_hands = 0
 
     for hand in hands:
-        hero_river = hand.get("hero_river_decision") or {}
-        if not hero_river:
-            continue
-
-        total += 1
-        atype = hero_river.get("action_type") or "unknown"
-
-        if atype in ("bet_vs_check", "bet", "raise_vs_bet", "raise"):
-            aggr += 1
-        elif atype in ("check", "call_vs_bet", "call"):
-            passive += 1
-        elif atype in ("fold_vs_bet", "fold"):
-            folds += 1
-
-        eq_info = hero_river.get("equity_estimate") or {}
-        eq_val = eq_info.get("estimated_equity")
-        numeric_eq: Optional[float] = None
-        if isinstance(eq_val, (int, float)):
-            numeric_eq = float(eq_val)
-
-        hand_id = hand.get("hand_id") or f"ID_{hand.get('id', '?')}"
-        if numeric_eq is not None and numeric_eq >= 0.70 and atype == "check":
-            missed_value += 1
-            if len(missed_ids) < 20:
-                missed_ids.append(hand_id)
-
-    return total, aggr, passive, folds, missed_value, missed_ids
+        total_hands += 1
+        get = hand.get
+
+        # --- decision_quality по всем улицам ---
+        for key in QUALITY_KEYS:
+            block = get(key)
+            if isinstance(block, dict):
+                dq_cols[key].append(block.get("decision_quality") or "unknown")
+
+        hero_flop = get("hero_flop_decision")
+        hero_turn = get("hero_turn_decision")
+        hero_river = get("hero_river_decision")
+
+        # --- c-bet (герой — префлоп-агрессор) ---
+        if hero_flop:
+            hero_pre = get("hero_preflop_analysis") or _EMPTY
+            if hero_pre.get("action_type") in PRE_AGGR:
+                cbet_col.append(hero_flop.get("action_type") or "unknown")
+
+        # --- агрессия на тёрне ---
+        if hero_turn:
+            turn_col.append(hero_turn.get("action_type") or "unknown")
+
+        # --- агрессия на ривере + missed value ---
+        if hero_river:
+            atype = hero_river.get("action_type") or "unknown"
+            river_col.append(atype)
+
+            if atype != "check":
+                continue
+            eq_info = hero_river.get("equity_estimate") or _EMPTY
+            eq_val = eq_info.get("estimated_equity")
+            if isinstance(eq_val, (int, float)) and float(eq_val) >= 0.70:
+                missed_value += 1
+                if missed_value <= MISSED_IDS_CAP:
+                    missed_ids.append(get("hand_id") or f"ID_{get('id', '?')}")
+
+    qualities = {key: Counter(col) for key, col in dq_cols.items()}
+    cbet_counts = Counter(cbet_col)
+    turn_counts = Counter(turn_col)
+    river_counts = Counter(river_col)
+
+    return {
+        "total_hands": total_hands,
+        "pre_total": len(dq_cols["hero_preflop_decision"]),
+        "pre_quality": qualities["hero_preflop_decision"],
+        "flop_total": len(dq_cols["hero_flop_decision"]),
+        "flop_quality": qualities["hero_flop_decision"],
+        "turn_total": len(dq_cols["hero_turn_decision"]),
+        "turn_quality": qualities["hero_turn_decision"],
+        "river_total": len(dq_cols["hero_river_decision"]),
+        "river_quality": qualities["hero_river_decision"],
+        "cbet_spots": len(cbet_col),
+        "cbet_made": _count_in(cbet_counts, CBET_TYPES),
+        "cbet_missed": cbet_counts["check"],
+        "t_total": len(turn_col),
+        "t_aggr": _count_in(turn_counts, AGGR_TYPES),
+        "t_pass": _count_in(turn_counts, PASSIVE_TYPES),
+        "t_fold": _count_in(turn_counts, FOLD_TYPES),
+        "r_total": len(river_col),
+        "r_aggr": _count_in(river_counts, AGGR_TYPES),
+        "r_pass": _count_in(river_counts, PASSIVE_TYPES),
+        "r_fold": _count_in(river_counts, FOLD_TYPES),
+        "missed_value": missed_value,
+        "missed_ids": missed_ids,
+    }
 
 
 def percent(part: int, whole: int) -> float:
@@ -146,172 +157,194 @@ def percent(part: int, whole: int) -> float:
     return part / whole * 100.0
 
 
-def print_quality_block(title: str, total: int, counts: Dict[str, int]) -> None:
-    print(title)
-    print(f"  Всего решений: {total}")
+def quality_block_lines(title: str, total: int, counts: Dict[str, int]) -> List[str]:
+    lines = [title, f"  Всего решений: {total}"]
     if total == 0:
-        print("  Нет данных.")
-        print()
-        return
+        lines.append("  Нет данных.")
+        lines.append("")
+        return lines
 
-    for key in sorted(counts.keys()):
-        cnt = counts[key]
-        pct = percent(cnt, total)
-        print(f"  - {key:7s}: {cnt:3d} раз ({pct:5.1f}%)")
-    print()
+    # total > 0: доли считаем сразу, без повторной проверки знаменателя в percent()
+    pct = {key: cnt / total * 100.0 for key, cnt in counts.items()}
+    for key in sorted(pct):
+        lines.append(f"  - {key:7s}: {counts[key]:3d} раз ({pct[key]:5.1f}%)")
+    lines.append("")
+    return lines
 
 
 def main() -> None:
     base_path = Path(__file__).resolve().parent
     hands_path = base_path / "hands.json"
 
-    hands = load_hands(hands_path)
-    total_hands = len(hands)
-
-    print()
-    print("==========================================")
-    print("        СЕССИОННЫЙ ПОСТФЛОП-ОТЧЁТ")
-    print("==========================================")
-    print()
-    print(f"Всего раздач в сессии: {total_hands}")
-    print()
+    stats = compute_all_session_stats(iter_hands(hands_path))
+    total_hands = stats["total_hands"]
+
+    # отчёт копим построчно и выводим одним write — дешевле, чем десятки print() при выводе в pipe/файл
+    out: List[str] = []
+    w = out.append
+
+    w("")
+    w("==========================================")
+    w("        СЕССИОННЫЙ ПОСТФЛОП-ОТЧЁТ")
+    w("==========================================")
+    w("")
+    w(f"Всего раздач в сессии: {total_hands}")
+    w("")
+
+    # пустая сессия: все блоки были бы нулевыми — сразу короткий итог
+    if total_hands == 0:
+        w("Нет данных для анализа.")
+        w("")
+        sys.stdout.write("\n".join(out) + "\n")
+        return
 
     # Префлоп
-    pre_total, pre_quality = collect_quality_counts(hands, "hero_preflop_decision")
-    print_quality_block("ПРЕФЛОП — качество решений (decision_quality):", pre_total, pre_quality)
+    pre_total, pre_quality = stats["pre_total"], stats["pre_quality"]
+    out.extend(quality_block_lines("ПРЕФЛОП — качество решений (decision_quality):", pre_total, pre_quality))
 
     # Флоп
-    flop_total, flop_quality = collect_quality_counts(hands, "hero_flop_decision")
-    print_quality_block("ФЛОП — качество решений (decision_quality):", flop_total, flop_quality)
+    flop_total, flop_quality = stats["flop_total"], stats["flop_quality"]
+    out.extend(quality_block_lines("ФЛОП — качество решений (decision_quality):", flop_total, flop_quality))
 
     # Тёрн
-    turn_total, turn_quality = collect_quality_counts(hands, "hero_turn_decision")
-    print_quality_block("ТЁРН — качество решений (decision_quality):", turn_total, turn_quality)
+    turn_total, turn_quality = stats["turn_total"], stats["turn_quality"]
+    out.extend(quality_block_lines("ТЁРН — качество решений (decision_quality):", turn_total, turn_quality))
 
     # Ривер
-    river_total, river_quality = collect_quality_counts(hands, "hero_river_decision")
-    print_quality_block("РИВЕР — качество решений (decision_quality):", river_total, river_quality)
+    river_total, river_quality = stats["river_total"], stats["river_quality"]
+    out.extend(quality_block_lines("РИВЕР — качество решений (decision_quality):", river_total, river_quality))
 
     # C-bet
-    cbet_spots, cbet_made, cbet_missed = compute_cbet_stats(hands)
-    print("ФЛОП — дисциплина C-bet (когда ты был префлоп-агрессором):")
-    print(f"  Всего c-bet спотов: {cbet_spots}")
+    cbet_spots, cbet_made, cbet_missed = stats["cbet_spots"], stats["cbet_made"], stats["cbet_missed"]
+    cbet_pct = percent(cbet_made, cbet_spots)
+    cbet_missed_pct = percent(cbet_missed, cbet_spots)
+    w("ФЛОП — дисциплина C-bet (когда ты был префлоп-агрессором):")
+    w(f"  Всего c-bet спотов: {cbet_spots}")
     if cbet_spots > 0:
-        print(f"  Сделан c-bet:        {cbet_made:3d} раз ({percent(cbet_made, cbet_spots):5.1f}%)")
-        print(f"  Пропущен c-bet:      {cbet_missed:3d} раз ({percent(cbet_missed, cbet_spots):5.1f}%)")
-    print()
+        w(f"  Сделан c-bet:        {cbet_made:3d} раз ({cbet_pct:5.1f}%)")
+        w(f"  Пропущен c-bet:      {cbet_missed:3d} раз ({cbet_missed_pct:5.1f}%)")
+    w("")
 
     # Тёрн агрессия
-    t_total, t_aggr, t_pass, t_fold = compute_turn_aggression(hands)
-    print("ТЁРН — дисциплина агрессии:")
-    print(f"  Всего решений на тёрне: {t_total}")
-    print(f"  Агрессивные линии (bet/raise): {t_aggr:3d} ({percent(t_aggr, t_total):5.1f}%)")
-    print(f"  Пассивные линии  (check/call): {t_pass:3d} ({percent(t_pass, t_total):5.1f}%)")
-    print(f"  Фолды против ставки:           {t_fold:3d} ({percent(t_fold, t_total):5.1f}%)")
-    print()
+    t_total, t_aggr, t_pass, t_fold = stats["t_total"], stats["t_aggr"], stats["t_pass"], stats["t_fold"]
+    t_aggr_pct = percent(t_aggr, t_total)
+    t_pass_pct = percent(t_pass, t_total)
+    t_fold_pct = percent(t_fold, t_total)
+    w("ТЁРН — дисциплина агрессии:")
+    w(f"  Всего решений на тёрне: {t_total}")
+    w(f"  Агрессивные линии (bet/raise): {t_aggr:3d} ({t_aggr_pct:5.1f}%)")
+    w(f"  Пассивные линии  (check/call): {t_pass:3d} ({t_pass_pct:5.1f}%)")
+    w(f"  Фолды против ставки:           {t_fold:3d} ({t_fold_pct:5.1f}%)")
+    w("")
 
     # Ривер агрессия + missed value
-    r_total, r_aggr, r_pass, r_fold, missed_value, missed_ids = compute_river_aggression_and_missed_value(hands)
-    print("РИВЕР — дисциплина агрессии и упущенное вэлью:")
-    print(f"  Всего решений на ривере: {r_total}")
-    print(f"  Агрессивные линии (bet/raise): {r_aggr:3d} ({percent(r_aggr, r_total):5.1f}%)")
-    print(f"  Пассивные линии  (check/call): {r_pass:3d} ({percent(r_pass, r_total):5.1f}%)")
-    print(f"  Фолды против ставки:           {r_fold:3d} ({percent(r_fold, r_total):5.1f}%)")
-    print(f"  Потенциально упущенное вэлью (high equity + check): {missed_value}")
+    r_total, r_aggr, r_pass, r_fold = stats["r_total"], stats["r_aggr"], stats["r_pass"], stats["r_fold"]
+    r_aggr_pct = percent(r_aggr, r_total)
+    r_pass_pct = percent(r_pass, r_total)
+    r_fold_pct = percent(r_fold, r_total)
+    missed_value, missed_ids = stats["missed_value"], stats["missed_ids"]
+    w("РИВЕР — дисциплина агрессии и упущенное вэлью:")
+    w(f"  Всего решений на ривере: {r_total}")
+    w(f"  Агрессивные линии (bet/raise): {r_aggr:3d} ({r_aggr_pct:5.1f}%)")
+    w(f"  Пассивные линии  (check/call): {r_pass:3d} ({r_pass_pct:5.1f}%)")
+    w(f"  Фолды против ставки:           {r_fold:3d} ({r_fold_pct:5.1f}%)")
+    w(f"  Потенциально упущенное вэлью (high equity + check): {missed_value}")
     if missed_value > 0:
-        print("  Примеры hand_id (не более 20):")
+        w("  Примеры hand_id (не более 20):")
         for hid in missed_ids:
-            print(f"    - {hid}")
-    print()
+            w(f"    - {hid}")
+    w("")
 
     # ------------------------------------
     # ЧЕЛОВЕКОЧИТАЕМЫЙ СУММАРНЫЙ РАЗБОР
     # ------------------------------------
 
-    print("==========================================")
-    print("     ЧЕЛОВЕКОЧИТАЕМЫЙ РАЗБОР СЕССИИ")
-    print("==========================================")
-    print()
+    w("==========================================")
+    w("     ЧЕЛОВЕКОЧИТАЕМЫЙ РАЗБОР СЕССИИ")
+    w("==========================================")
+    w("")
 
     # Префлоп вывод
-    print("Префлоп:")
+    w("Префлоп:")
     if pre_total == 0:
-        print("  Модель не нашла ни одного решения героя на префлопе (возможно, ошибка парсинга).")
+        w("  Модель не нашла ни одного решения героя на префлопе (возможно, ошибка парсинга).")
     else:
-        good_pre = pre_quality.get("good", 0)
-        risky_pre = pre_quality.get("risky", 0) + pre_quality.get("mistake", 0) + pre_quality.get("bad", 0)
-        print(f"  В сессии зафиксировано {pre_total} префлоп-решений героя.")
-        print(f"  Доля аккуратных/хороших решений (good): {percent(good_pre, pre_total):.1f}%")
+        good_pre = pre_quality["good"]
+        risky_pre = pre_quality["risky"] + pre_quality["mistake"] + pre_quality["bad"]
+        w(f"  В сессии зафиксировано {pre_total} префлоп-решений героя.")
+        w(f"  Доля аккуратных/хороших решений (good): {percent(good_pre, pre_total):.1f}%")
         if risky_pre > 0:
-            print(f"  Доля рискованных/ошибочных решений (risky/mistake/bad): {percent(risky_pre, pre_total):.1f}%")
-            print("  Есть споты, где диапазон открытия/колла можно подтянуть ближе к MOS-чартам.")
+            w(f"  Доля рискованных/ошибочных решений (risky/mistake/bad): {percent(risky_pre, pre_total):.1f}%")
+            w("  Есть споты, где диапазон открытия/колла можно подтянуть ближе к MOS-чартам.")
         else:
-            print("  Отклонений от базовой префлоп-стратегии почти нет, дисциплина высокая.")
-    print()
+            w("  Отклонений от базовой префлоп-стратегии почти нет, дисциплина высокая.")
+    w("")
 
     # Флоп вывод
-    print("Флоп:")
+    w("Флоп:")
     if flop_total == 0:
-        print("  Герой ни разу не дошёл до флопа или модель не зафиксировала действия.")
+        w("  Герой ни разу не дошёл до флопа или модель не зафиксировала действия.")
     else:
-        good_flop = flop_quality.get("good", 0)
-        risky_flop = flop_quality.get("risky", 0) + flop_quality.get("bad", 0)
-        print(f"  Всего решений на флопе: {flop_total}")
-        print(f"  Хорошие решения (good): {percent(good_flop, flop_total):.1f}%")
+        good_flop = flop_quality["good"]
+        risky_flop = flop_quality["risky"] + flop_quality["bad"]
+        w(f"  Всего решений на флопе: {flop_total}")
+        w(f"  Хорошие решения (good): {percent(good_flop, flop_total):.1f}%")
         if risky_flop > 0:
-            print(f"  Рискованные/спорные решения: {percent(risky_flop, flop_total):.1f}%")
+            w(f"  Рискованные/спорные решения: {percent(risky_flop, flop_total):.1f}%")
         if cbet_spots > 0:
-            print(f"  C-bet в позициях агрессора: {percent(cbet_made, cbet_spots):.1f}% из {cbet_spots} спотов.")
-            print("  Это даёт представление о том, как часто ты конвертишь префлоп-инициативу в давление на флопе.")
-        print("  В целом флоп выглядит достаточно дисциплинированно, без сильного переигрыша рук.")
-    print()
+            w(f"  C-bet в позициях агрессора: {cbet_pct:.1f}% из {cbet_spots} спотов.")
+            w("  Это даёт представление о том, как часто ты конвертишь префлоп-инициативу в давление на флопе.")
+        w("  В целом флоп выглядит достаточно дисциплинированно, без сильного переигрыша рук.")
+    w("")
 
     # Тёрн вывод
-    print("Тёрн:")
+    w("Тёрн:")
     if turn_total == 0:
-        print("  Не зафиксировано ни одного решения на тёрне.")
+        w("  Не зафиксировано ни одного решения на тёрне.")
     else:
-        good_turn = turn_quality.get("good", 0)
-        risky_turn = turn_quality.get("risky", 0) + turn_quality.get("bad", 0)
-        print(f"  Всего решений на тёрне: {turn_total}")
-        print(f"  Хорошие решения (good): {percent(good_turn, turn_total):.1f}%")
+        good_turn = turn_quality["good"]
+        risky_turn = turn_quality["risky"] + turn_quality["bad"]
+        w(f"  Всего решений на тёрне: {turn_total}")
+        w(f"  Хорошие решения (good): {percent(good_turn, turn_total):.1f}%")
         if risky_turn > 0:
-            print(f"  Рискованные/спорные решения: {percent(risky_turn, turn_total):.1f}%")
-        print(f"  Агрессия на тёрне: {percent(t_aggr, t_total):.1f}% агрессивных линий, "
-              f"{percent(t_pass, t_total):.1f}% пассивных, {percent(t_fold, t_total):.1f}% фолдов.")
-        print("  По тёрну у тебя, как правило, аккуратная игра с разумным балансом агрессии и контроля банка.")
-    print()
+            w(f"  Рискованные/спорные решения: {percent(risky_turn, turn_total):.1f}%")
+        w(f"  Агрессия на тёрне: {t_aggr_pct:.1f}% агрессивных линий, "
+              f"{t_pass_pct:.1f}% пассивных, {t_fold_pct:.1f}% фолдов.")
+        w("  По тёрну у тебя, как правило, аккуратная игра с разумным балансом агрессии и контроля банка.")
+    w("")
 
     # Ривер вывод
-    print("Ривер:")
+    w("Ривер:")
     if river_total == 0:
-        print("  Не зафиксировано ни одного решения на ривере.")
+        w("  Не зафиксировано ни одного решения на ривере.")
     else:
-        good_river = river_quality.get("good", 0)
-        risky_river = river_quality.get("risky", 0) + river_quality.get("bad", 0)
-        print(f"  Всего решений на ривере: {river_total}")
-        print(f"  Хорошие решения (good): {percent(good_river, river_total):.1f}%")
+        good_river = river_quality["good"]
+        risky_river = river_quality["risky"] + river_quality["bad"]
+        w(f"  Всего решений на ривере: {river_total}")
+        w(f"  Хорошие решения (good): {percent(good_river, river_total):.1f}%")
         if risky_river > 0:
-            print(f"  Рискованные/спорные решения: {percent(risky_river, river_total):.1f}%")
-        print(f"  Агрессия на ривере: {percent(r_aggr, r_total):.1f}% агрессивных линий, "
-              f"{percent(r_pass, r_total):.1f}% пассивных, {percent(r_fold, r_total):.1f}% фолдов.")
+            w(f"  Рискованные/спорные решения: {percent(risky_river, river_total):.1f}%")
+        w(f"  Агрессия на ривере: {r_aggr_pct:.1f}% агрессивных линий, "
+              f"{r_pass_pct:.1f}% пассивных, {r_fold_pct:.1f}% фолдов.")
         if missed_value > 0:
-            print(f"  Найдено {missed_value} потенциальных случаев упущенного вэлью (high equity + чек).")
-            print("  Эти споты особенно полезно разобрать вручную: там можно было добрать фишки, но ты выбрал контроль банка.")
+            w(f"  Найдено {missed_value} потенциальных случаев упущенного вэлью (high equity + чек).")
+            w("  Эти споты особенно полезно разобрать вручную: там можно было добрать фишки, но ты выбрал контроль банка.")
         else:
-            print("  Явных missed value спотов по критерию high equity + check не найдено.")
-    print()
-
-    print("Общий вывод:")
-    print("  Модель видит достаточно высокий процент хороших решений на всех улицах и отсутствие явных провалов.")
-    print("  Основные точки роста обычно лежат в двух направлениях:")
-    print("    1) Более агрессивный добор вэлью на тёрне/ривере там, где equity достаточно высока.")
-    print("    2) Тонкая настройка диапазонов колла/фолда в пограничных спотах (особенно на ривере).")
-    print()
-    print("Рекомендуется выборочно пройтись по помеченным рискованным решениям и missed value-раздачам,")
-    print("используя скрипт детального разбора одной руки (report_hand_detail.py),")
-    print("и смотреть, какие линии давали бы больше EV при тех же бордах и действиях оппонентов.")
-    print()
+            w("  Явных missed value спотов по критерию high equity + check не найдено.")
+    w("")
+
+    w("Общий вывод:")
+    w("  Модель видит достаточно высокий процент хороших решений на всех улицах и отсутствие явных провалов.")
+    w("  Основные точки роста обычно лежат в двух направлениях:")
+    w("    1) Более агрессивный добор вэлью на тёрне/ривере там, где equity достаточно высока.")
+    w("    2) Тонкая настройка диапазонов колла/фолда в пограничных спотах (особенно на ривере).")
+    w("")
+    w("Рекомендуется выборочно пройтись по помеченным рискованным решениям и missed value-раздачам,")
+    w("используя скрипт детального разбора одной руки (report_hand_detail.py),")
+    w("и смотреть, какие линии давали бы больше EV при тех же бордах и действиях оппонентов.")
+    w("")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional, Dict, Any, Tuple
 
 from .ev_tools import compute_ev_estimate_v1, generate_assumptions, generate_context
 
@@ -11,7 +15,7 @@ from .ev_tools import compute_ev_estimate_v1, generate_assumptions, generate_con
 # ---------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PreflopDecisionMath:
     """
     Чистая математика решения героя на префлопе.
@@ -33,7 +37,7 @@ class PreflopDecisionMath:
     final_pot_if_called: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PreflopDecisionEvaluation:
     """
     Итоговая оценка решения героя на префлопе.
@@ -53,6 +57,33 @@ class PreflopDecisionEvaluation:
     comment: str
 
 
+def _math_to_dict(m: PreflopDecisionMath) -> Dict[str, Any]:
+    # все поля — скаляры, поэтому обходимся без asdict (fields() + deepcopy на каждый вызов)
+    return {
+        "pot_before": m.pot_before,
+        "investment": m.investment,
+        "pot_odds": m.pot_odds,
+        "required_equity": m.required_equity,
+        "estimated_equity": m.estimated_equity,
+        "ev_simple": m.ev_simple,
+        "model": m.model,
+        "fold_equity": m.fold_equity,
+        "final_pot_if_called": m.final_pot_if_called,
+    }
+
+
+def _eval_to_dict(e: PreflopDecisionEvaluation) -> Dict[str, Any]:
+    # math и range_discipline — свежие dict'ы этого вызова, копировать их не нужно
+    return {
+        "action_type": e.action_type,
+        "action_kind": e.action_kind,
+        "decision_quality": e.decision_quality,
+        "math": e.math,
+        "range_discipline": e.range_discipline,
+        "comment": e.comment,
+    }
+
+
 # порядок позиций для дисциплины по рейнджу
 POSITION_ORDER: Dict[str, int] = {
     "UTG": 0,
@@ -80,6 +111,9 @@ MOS_POSITION_ORDER: Dict[str, int] = {
 def _safe_positive(value: Optional[float]) -> Optional[float]:
     if value is None:
         return None
+    if isinstance(value, (int, float)):
+        v = float(value)
+        return None if v <= 0 else v
     try:
         v = float(value)
     except (TypeError, ValueError):
@@ -89,7 +123,20 @@ def _safe_positive(value: Optional[float]) -> Optional[float]:
     return v
 
 
+def _safe_float(value: Optional[float]) -> Optional[float]:
+    if type(value) is float:
+        return value
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def _safe_int(value: Optional[int]) -> Optional[int]:
+    if type(value) is int:
+        return value
     if value is None:
         return None
     try:
@@ -98,38 +145,33 @@ def _safe_int(value: Optional[int]) -> Optional[int]:
         return None
 
 
-def _estimate_fold_equity(
+# базовая FE опена по позициям героя, индекс — POSITION_ORDER (UTG, MP, HJ, CO, BTN, SB, BB)
+_FE_OPEN_BY_POS = (0.35, 0.38, 0.42, 0.48, 0.52, 0.30, 0.10)
+
+# типы рейзов, для которых FE различается; всё остальное — один общий ключ None
+_FE_ACTIONS = ("open_raise", "iso_raise", "3bet", "4bet", "5bet_plus")
+
+# действия, которые считаем по raise-модели с FE
+_RAISE_LIKE = frozenset(_FE_ACTIONS)
+
+
+def _fold_equity_formula(
     action_type: Optional[str],
-    hero_position: Optional[str],
-    facing_raises: Optional[int],
-    effective_stack_bb: Optional[float],
+    pos: Optional[str],
+    many_raises: bool,
+    stack_bucket: int,
 ) -> float:
     """
-    Грубая эвристика fold equity для разных типов рейзов и позиций.
+    Сама эвристика FE; используется только для заполнения _FE_TABLE при импорте.
 
-    Это НЕ солвер и не GTO, а разумный MVP:
-      - ранние позиции → меньше FE
-      - поздние позиции → больше FE
-      - 3бет/4бет → выше FE
-      - короткие стеки → люди чаще коллят (FE чуть меньше)
-      - глубокие стеки → люди чаще выкидывают (FE чуть больше)
+    pos=None — позиция вне POSITION_ORDER; stack_bucket: -1 (<40bb), 0, 1 (>120bb).
     """
-    pos = (hero_position or "CO").upper()
-
-    fe_open_by_pos = {
-        "UTG": 0.35,
-        "MP": 0.38,
-        "HJ": 0.42,
-        "CO": 0.48,
-        "BTN": 0.52,
-        "SB": 0.30,
-        "BB": 0.10,
-    }
+    open_fe = _FE_OPEN_BY_POS[POSITION_ORDER[pos]] if pos is not None else 0.40
 
     if action_type == "open_raise":
-        base_fe = fe_open_by_pos.get(pos, 0.40)
+        base_fe = open_fe
     elif action_type == "iso_raise":
-        base_fe = fe_open_by_pos.get(pos, 0.40) - 0.05
+        base_fe = open_fe - 0.05
     elif action_type == "3bet":
         base_fe = 0.50 if pos in ("CO", "BTN") else 0.45
     elif action_type == "4bet":
@@ -139,24 +181,111 @@ def _estimate_fold_equity(
     else:
         base_fe = 0.30
 
-    fr = _safe_int(facing_raises) or 0
-    if fr >= 2:
+    if many_raises:
         base_fe -= 0.05
 
-    if effective_stack_bb is not None:
-        try:
-            eff = float(effective_stack_bb)
-            if eff < 40:
-                base_fe -= 0.05
-            elif eff > 120:
-                base_fe += 0.05
-        except (TypeError, ValueError):
-            pass
+    if stack_bucket < 0:
+        base_fe -= 0.05
+    elif stack_bucket > 0:
+        base_fe += 0.05
 
     return max(0.05, min(0.75, base_fe))
 
 
-def compute_preflop_math(
+# Все входы FE дискретны → вся эвристика сводится к таблице (action, pos, fr>=2, stack_bucket)
+_FE_TABLE: Dict[tuple, float] = {
+    (a, p, fr2, sb): _fold_equity_formula(a, p, fr2, sb)
+    for a in _FE_ACTIONS + (None,)
+    for p in tuple(POSITION_ORDER) + (None,)
+    for fr2 in (False, True)
+    for sb in (-1, 0, 1)
+}
+
+
+@lru_cache(maxsize=64)
+def _canon_action(action_type: Optional[str]) -> Optional[str]:
+    """Интернированный токен рейза из _FE_ACTIONS или None для всего остального."""
+    if action_type in _FE_ACTIONS:
+        return sys.intern(action_type)
+    return None
+
+
+@lru_cache(maxsize=64)
+def _canon_pos(hero_position: Optional[str]) -> Optional[str]:
+    """Интернированная позиция из POSITION_ORDER (по умолчанию CO) или None, если позиция неизвестна."""
+    pos = (hero_position or "CO").upper()
+    if pos in POSITION_ORDER:
+        return sys.intern(pos)
+    return None
+
+
+# частые написания позиции -> каноничная строка; None/"" — дефолт CO, как в _canon_pos
+_POSITION_NORMALIZE: Dict[Optional[str], str] = {
+    v: p for p in POSITION_ORDER for v in (p, p.lower(), p.capitalize())
+}
+_POSITION_NORMALIZE[None] = _POSITION_NORMALIZE[""] = "CO"
+
+
+@lru_cache(maxsize=64)
+def _label_token(value: Optional[str]) -> str:
+    """Позиция в нижнем регистре для лейблов ev_action (словарь позиций маленький)."""
+    return sys.intern((value or "unknown").lower())
+
+
+def _stack_bucket(effective_stack_bb: Optional[float]) -> int:
+    eff = _safe_float(effective_stack_bb)
+    if eff is None:
+        return 0
+    if eff < 40:
+        return -1
+    if eff > 120:
+        return 1
+    return 0
+
+
+def _estimate_fold_equity(
+    action_type: Optional[str],
+    hero_position: Optional[str],
+    facing_raises: Optional[int],
+    effective_stack_bb: Optional[float],
+) -> float:
+    """
+    Грубая эвристика fold equity для разных типов рейзов и позиций.
+
+    Это НЕ солвер и не GTO, а разумный MVP:
+      - ранние позиции → меньше FE
+      - поздние позиции → больше FE
+      - 3бет/4бет → выше FE
+      - короткие стеки → люди чаще коллят (FE чуть меньше)
+      - глубокие стеки → люди чаще выкидывают (FE чуть больше)
+
+    Значения заранее посчитаны в _FE_TABLE, здесь только нормализация ключа.
+    """
+    # частые написания — через словарь, без upper(); остальное — через кэш _canon_pos
+    pos = _POSITION_NORMALIZE.get(hero_position) or _canon_pos(hero_position)
+    fr = facing_raises if type(facing_raises) is int else (_safe_int(facing_raises) or 0)
+    key = (
+        _canon_action(action_type),
+        pos,
+        fr >= 2,
+        _stack_bucket(effective_stack_bb),
+    )
+    return _FE_TABLE[key]
+
+
+def _call_ev(pot_b: float, inv: float, equity: float) -> float:
+    """EV колла без FE; аргументы — уже проверенные float."""
+    return equity * (pot_b + inv) - (1.0 - equity) * inv
+
+
+def _raise_fe_ev(pot_b: float, inv: float, equity: float, fe: float) -> tuple:
+    """EV рейза с FE и размер банка при колле; аргументы — уже проверенные float."""
+    final_pot = pot_b + 2.0 * inv
+    ev = fe * pot_b + (1.0 - fe) * (equity * final_pot - (1.0 - equity) * inv)
+    return ev, final_pot
+
+
+def _compute_math_and_quality(
     pot_before: Optional[float],
     investment: Optional[float],
     estimated_equity: Optional[float],
@@ -164,8 +293,13 @@ def compute_preflop_math(
     hero_position: Optional[str],
     facing_raises: Optional[int],
     effective_stack_bb: Optional[float],
-) -> PreflopDecisionMath:
+    fold_equity: Optional[float] = None,
+    is_raise_like: Optional[bool] = None,
+) -> Tuple[PreflopDecisionMath, Quality, Optional[float]]:
     """
+    Математика решения + базовое качество + edge (equity - required_equity) за один проход.
+    edge = None, когда качество "unknown".
+
     Считает pot odds, required_equity и EV решения героя.
 
     Два режима:
@@ -174,60 +308,53 @@ def compute_preflop_math(
       - RAISE-МОДЕЛЬ С FE (raise_fe_model):
           FE оценивается эвристикой, final_pot_if_called ≈ pot_before + 2 * investment
           EV = FE * pot_before + (1 - FE) * [equity * final_pot_if_called - (1 - equity) * investment]
+
+    fold_equity — уже посчитанная FE (если вызывающий её знает), иначе оценивается здесь.
     """
     pot_b = _safe_positive(pot_before)
     inv = _safe_positive(investment)
+    equity = _safe_float(estimated_equity)
 
-    if estimated_equity is None:
-        equity = None
+    # pot odds пишутся в результат даже без equity, поэтому пот/ставку санитизируем всегда
+    if pot_b is None or inv is None:
+        pot_odds = None
     else:
-        try:
-            equity = float(estimated_equity)
-        except (TypeError, ValueError):
-            equity = None
-
-    pot_odds = None
-    required_equity = None
-    ev_simple = None
-    model = None
-    fe_used = None
-    final_pot_if_called = None
-
-    if pot_b is not None and inv is not None:
         pot_odds = inv / (pot_b + inv)
-        required_equity = pot_odds
 
-    if pot_b is None or inv is None or equity is None:
-        return PreflopDecisionMath(
+    if pot_odds is None or equity is None:
+        math = PreflopDecisionMath(
             pot_before=pot_b,
             investment=inv,
             pot_odds=pot_odds,
-            required_equity=required_equity,
+            required_equity=pot_odds,
             estimated_equity=equity,
-            ev_simple=ev_simple,
-            model=model,
-            fold_equity=fe_used,
-            final_pot_if_called=final_pot_if_called,
+            ev_simple=None,
         )
+        return math, Quality.UNKNOWN, None
 
-    raise_like_actions = {"open_raise", "iso_raise", "3bet", "4bet", "5bet_plus"}
-    if action_type in raise_like_actions:
-        fe_used = _estimate_fold_equity(
-            action_type=action_type,
-            hero_position=hero_position,
-            facing_raises=facing_raises,
-            effective_stack_bb=effective_stack_bb,
-        )
-        final_pot_if_called = pot_b + 2.0 * inv
-        ev_simple = fe_used * pot_b + (1.0 - fe_used) * (
-            equity * final_pot_if_called - (1.0 - equity) * inv
-        )
+    required_equity = pot_odds
+    fe_used = None
+    final_pot_if_called = None
+
+    if is_raise_like is None:
+        is_raise_like = action_type in _RAISE_LIKE
+    if is_raise_like:
+        if fold_equity is not None:
+            fe_used = fold_equity
+        else:
+            fe_used = _estimate_fold_equity(
+                action_type=action_type,
+                hero_position=hero_position,
+                facing_raises=facing_raises,
+                effective_stack_bb=effective_stack_bb,
+            )
+        ev_simple, final_pot_if_called = _raise_fe_ev(pot_b, inv, equity, fe_used)
         model = "raise_fe_model"
     else:
-        ev_simple = equity * (pot_b + inv) - (1.0 - equity) * inv
+        ev_simple = _call_ev(pot_b, inv, equity)
         model = "call_model"
 
-    return PreflopDecisionMath(
+    math = PreflopDecisionMath(
         pot_before=pot_b,
         investment=inv,
         pot_odds=pot_odds,
@@ -238,64 +365,120 @@ def compute_preflop_math(
         fold_equity=fe_used,
         final_pot_if_called=final_pot_if_called,
     )
+    # здесь pot_b, inv и equity известны → required_equity тоже
+    edge = equity - required_equity
+    return math, _quality_code_from_edge(edge), edge
+
 
+# результат математики, когда нет ни пота, ни ставки, ни equity (dataclass frozen — можно делить)
+_UNKNOWN_MATH = PreflopDecisionMath(
+    pot_before=None,
+    investment=None,
+    pot_odds=None,
+    required_equity=None,
+    estimated_equity=None,
+    ev_simple=None,
+)
 
+
+def compute_preflop_math(
+    pot_before: Optional[float],
+    investment: Optional[float],
+    estimated_equity: Optional[float],
+    action_type: Optional[str],
+    hero_position: Optional[str],
+    facing_raises: Optional[int],
+    effective_stack_bb: Optional[float],
+    fold_equity: Optional[float] = None,
+    is_raise_like: Optional[bool] = None,
+) -> PreflopDecisionMath:
+    """
+    Только математика решения (см. _compute_math_and_quality).
+    """
+    math, _, _ = _compute_math_and_quality(
+        pot_before=pot_before,
+        investment=investment,
+        estimated_equity=estimated_equity,
+        action_type=action_type,
+        hero_position=hero_position,
+        facing_raises=facing_raises,
+        effective_stack_bb=effective_stack_bb,
+        fold_equity=fold_equity,
+        is_raise_like=is_raise_like,
+    )
+    return math
+
+
+# шаблоны лейблов ev_action по типу действия; hp/vp — позиции героя/оппонента в нижнем регистре
+_PREFLOP_LABEL_FMT: Dict[str, str] = {
+    "open_raise": "open_raise_from_{hp}",
+    "3bet": "3bet_vs_{vp}_raise",
+    "4bet": "4bet_vs_{vp}_3bet",
+    "call_vs_raise": "call_vs_{vp}_raise",
+}
+
+
+@lru_cache(maxsize=128)
 def get_preflop_ev_action(action_type: Optional[str], hero_position: Optional[str], villain_position: Optional[str]) -> str:
     """
     Возвращает строковый лейбл контекста для префлопа (для логов/объяснений).
     """
-    hp = (hero_position or "unknown").lower()
-    vp = (villain_position or "unknown").lower()
-
-    if action_type == "open_raise":
-        return f"open_raise_from_{hp}"
-    if action_type == "3bet":
-        return f"3bet_vs_{vp}_raise"
-    if action_type == "4bet":
-        return f"4bet_vs_{vp}_3bet"
-    if action_type == "call_vs_raise":
-        return f"call_vs_{vp}_raise"
+    fmt = _PREFLOP_LABEL_FMT.get(action_type)
+    if fmt is not None:
+        return fmt.format(hp=_label_token(hero_position), vp=_label_token(villain_position))
     if action_type:
         return action_type
     return "unknown_preflop_action"
 
 
-def _classify_decision_quality_base(math: PreflopDecisionMath) -> str:
-    if math.estimated_equity is None or math.required_equity is None:
-        return "unknown"
+class Quality(IntEnum):
+    """
+    Внутреннее представление decision_quality: сравнения и понижения — целочисленные,
+    строка ("good", "mistake", ...) получается только при сборке результата (.label).
+    """
+    UNKNOWN = -1
+    BLUNDER = 0
+    MISTAKE = 1
+    MARGINAL = 2
+    GOOD = 3
+
+    @property
+    def label(self) -> str:
+        return _QUALITY_LABELS[self]
+
+
+_QUALITY_LABELS = {q: q.name.lower() for q in Quality}
+
+# границы edge: [-0.05, 0) → mistake, [0, 0.06) → marginal, >= 0.06 → good, ниже — blunder
+_QUALITY_THRESHOLDS = (-0.05, 0.0, 0.06)
+_QUALITY_BY_CODE = (Quality.BLUNDER, Quality.MISTAKE, Quality.MARGINAL, Quality.GOOD)
 
-    edge = math.estimated_equity - math.required_equity
-    if edge >= 0.06:
-        return "good"
-    if 0.0 <= edge < 0.06:
-        return "marginal"
-    if -0.05 <= edge < 0.0:
-        return "mistake"
-    return "blunder"
+
+def _quality_code_from_edge(edge: float) -> Quality:
+    if edge != edge:  # NaN не попадает ни в один интервал
+        return Quality.BLUNDER
+    return _QUALITY_BY_CODE[bisect_right(_QUALITY_THRESHOLDS, edge)]
 
 
 def _adjust_quality_by_range_discipline(
-    base_quality: str,
+    base_quality: Quality,
     range_discipline: Optional[Dict[str, Any]],
     action_type: Optional[str],
-) -> str:
+) -> Quality:
     if not range_discipline:
         return base_quality
 
     err = range_discipline.get("error_type")
 
     if err in ("too_loose_open", "too_early_position_open"):
-        if base_quality == "good":
-            return "marginal"
-        if base_quality == "marginal":
-            return "mistake"
-        if base_quality == "mistake":
-            return "blunder"
+        # понижаем на одну ступень: good → marginal → mistake → blunder
+        if base_quality >= Quality.MISTAKE:
+            return Quality(base_quality - 1)
         return base_quality
 
     if err == "too_tight_fold":
-        if base_quality in ("unknown", "marginal", "good"):
-            return "mistake"
+        if base_quality in (Quality.UNKNOWN, Quality.MARGINAL, Quality.GOOD):
+            return Quality.MISTAKE
         return base_quality
 
     return base_quality
@@ -324,27 +507,74 @@ def _compute_range_discipline(
     }
 
 
+_COMMENT_NO_DATA = " Не удалось оценить: не хватает данных по поту/ставке/equity."
+_COMMENT_NO_MATH = " Оценка выполнена, но без детальной математики."
+
+
 def _build_comment(
     action_type: Optional[str],
     action_kind: Optional[str],
     math: PreflopDecisionMath,
-    quality: str,
+    quality: Quality,
     range_discipline: Optional[Dict[str, Any]],
+    edge: Optional[float] = None,
 ) -> str:
     base = f"Тип действия: {action_type or 'unknown'}. Формат: {action_kind or 'unknown'}."
-    if quality == "unknown":
-        return base + " Не удалось оценить: не хватает данных по поту/ставке/equity."
+    if quality == Quality.UNKNOWN:
+        return base + _COMMENT_NO_DATA
 
     req = math.required_equity
     eq = math.estimated_equity
     if req is None or eq is None:
-        return base + " Оценка выполнена, но без детальной математики."
+        return base + _COMMENT_NO_MATH
+
+    if edge is None:
+        edge = eq - req
+    parts = [
+        base,
+        f" ReqEq≈{req:.2f} ({req*100:.1f}%), Eq≈{eq:.2f} ({eq*100:.1f}%), edge≈{edge:.2f}.",
+    ]
+    range_comment = range_discipline.get("range_comment") if range_discipline else None
+    if range_comment:
+        parts.append(" ")
+        parts.append(str(range_comment))
+    return "".join(parts)
+
+
+def _preflop_ev_context(
+    hero_position: Optional[str],
+    eff_bb: Optional[float],
+    action_kind: Optional[str],
+) -> Tuple[Dict[str, Any], str]:
+    """Контекст и допущения для префлоп ev_estimate (eff_bb — уже санитизированный стек)."""
+    ctx = generate_context(
+        multiway=False,
+        hero_ip=False,
+        hero_position=hero_position or "unknown",
+        villain_position="unknown",
+        effective_stack=eff_bb or 0.0,
+        board_texture="preflop",
+    )
+    return ctx, generate_assumptions("preflop", action_kind or "unknown", ctx)
+
 
-    edge = eq - req
-    s = base + f" ReqEq≈{req:.2f} ({req*100:.1f}%), Eq≈{eq:.2f} ({eq*100:.1f}%), edge≈{edge:.2f}."
-    if range_discipline and range_discipline.get("range_comment"):
-        s += " " + str(range_discipline.get("range_comment"))
-    return s
+# вход — позиция (7 значений), стек, action_kind: пространство маленькое, кэшируем целиком
+_cached_preflop_ev_context = lru_cache(maxsize=512, typed=True)(_preflop_ev_context)
+
+
+def _shared_preflop_ev_context(
+    hero_position: Optional[str],
+    eff_bb: Optional[float],
+    action_kind: Optional[str],
+) -> Tuple[Dict[str, Any], str]:
+    """
+    (ctx, assumptions) из кэша; ctx копируется, т.к. он попадает в результат по ссылке.
+    """
+    try:
+        ctx, assumptions = _cached_preflop_ev_context(hero_position, eff_bb, action_kind)
+    except TypeError:  # нехешируемые поля — без кэша
+        return _preflop_ev_context(hero_position, eff_bb, action_kind)
+    return dict(ctx), assumptions
 
 
 def evaluate_preflop_decision(
@@ -360,21 +590,44 @@ def evaluate_preflop_decision(
     was_first_in: Optional[bool],
     facing_raises: Optional[int],
     effective_stack_bb: Optional[float],
+    include_comment: bool = True,
 ) -> Dict[str, Any]:
     """
     Главная функция: оценка решения героя на префлопе + ev_estimate.
+
+    include_comment=False — не форматировать человекочитаемый comment (будет "").
     """
-    math = compute_preflop_math(
-        pot_before=pot_before,
-        investment=investment,
-        estimated_equity=estimated_equity,
-        action_type=action_type,
-        hero_position=hero_position,
-        facing_raises=facing_raises,
-        effective_stack_bb=effective_stack_bb,
+    is_raise_like = action_type in _RAISE_LIKE
+    # стек санитизируем один раз: дальше и FE, и контекст получают готовый float/None
+    eff_bb = _safe_float(effective_stack_bb)
+
+    # FE нужна и для математики, и для ev_estimate — считаем один раз
+    fold_equity = (
+        _estimate_fold_equity(
+            action_type=action_type,
+            hero_position=hero_position,
+            facing_raises=facing_raises,
+            effective_stack_bb=eff_bb,
+        )
+        if is_raise_like
+        else 0.0
     )
 
-    base_quality = _classify_decision_quality_base(math)
+    if pot_before is None and investment is None and estimated_equity is None:
+        # считать нечего: математика заведомо пустая, качество — unknown
+        math, base_quality, edge = _UNKNOWN_MATH, Quality.UNKNOWN, None
+    else:
+        math, base_quality, edge = _compute_math_and_quality(
+            pot_before=pot_before,
+            investment=investment,
+            estimated_equity=estimated_equity,
+            action_type=action_type,
+            hero_position=hero_position,
+            facing_raises=facing_raises,
+            effective_stack_bb=eff_bb,
+            fold_equity=fold_equity,
+            is_raise_like=is_raise_like,
+        )
 
     range_discipline = _compute_range_discipline(
         hero_position=hero_position,
@@ -390,46 +643,30 @@ def evaluate_preflop_decision(
         action_type=action_type,
     )
 
+    # текст нужен только для человека; программным потребителям можно его не строить
     comment = _build_comment(
         action_type=action_type,
         action_kind=action_kind,
         math=math,
         quality=final_quality,
         range_discipline=range_discipline,
-    )
+        edge=edge,
+    ) if include_comment else ""
 
     evaluation = PreflopDecisionEvaluation(
         action_type=action_type,
         action_kind=action_kind,
-        decision_quality=final_quality,
-        math=asdict(math),
+        decision_quality=final_quality.label,
+        math=_math_to_dict(math),
         range_discipline=range_discipline,
         comment=comment,
     )
 
     # Контекст для EV
-    ctx = generate_context(
-        multiway=False,
-        hero_ip=False,
-        hero_position=hero_position or "unknown",
-        villain_position="unknown",
-        effective_stack=float(effective_stack_bb or 0.0),
-        board_texture="preflop",
-    )
+    ctx, assumptions = _shared_preflop_ev_context(hero_position, eff_bb, action_kind)
 
     ev_label = get_preflop_ev_action(action_type, hero_position, "unknown")
 
-    fold_equity = (
-        _estimate_fold_equity(
-            action_type=action_type,
-            hero_position=hero_position,
-            facing_raises=facing_raises,
-            effective_stack_bb=effective_stack_bb,
-        )
-        if action_type in {"open_raise", "iso_raise", "3bet", "4bet", "5bet_plus"}
-        else 0.0
-    )
-
     # ВАЖНО: передаем И ev_action_label (новое), И ev_action (старое) — это anti-conflict.
     ev_estimate = compute_ev_estimate_v1(
         street="preflop",
@@ -441,12 +678,12 @@ def evaluate_preflop_decision(
         final_pot_if_called=None,
         ev_action_label=ev_label,
         ev_action=ev_label,  # legacy совместимость
-        assumptions=generate_assumptions("preflop", action_kind or "unknown", ctx),
+        assumptions=assumptions,
         confidence=0.7,
         context=ctx,
         alternatives={},
     )
 
-    out = asdict(evaluation)
+    out = _eval_to_dict(evaluation)
     out["ev_estimate"] = ev_estimate
     return out
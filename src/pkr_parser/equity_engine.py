@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
 from .range_store import mos_min_position
 
 
@@ -14,7 +15,7 @@ RANKS = "23456789TJQKA"
 RANK_TO_INDEX: Dict[str, int] = {r: i for i, r in enumerate(RANKS)}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PreflopEquityEstimate:
     """
     Оценка силы руки героя на префлопе.
@@ -35,6 +36,20 @@ class PreflopEquityEstimate:
     notes: Optional[str] = None
 
 
+def _estimate_to_dict(e: PreflopEquityEstimate) -> Dict[str, Any]:
+    # все поля — скаляры/строки, asdict (fields() + deepcopy) здесь не нужен
+    return {
+        "hand_key": e.hand_key,
+        "category": e.category,
+        "strength_score": e.strength_score,
+        "estimated_equity_vs_unknown": e.estimated_equity_vs_unknown,
+        "hero_position": e.hero_position,
+        "villain_position": e.villain_position,
+        "mos_min_position": e.mos_min_position,
+        "notes": e.notes,
+    }
+
+
 # ---------------------------------------------------------------------
 #  ТВОЙ MOS-RFI (ИЗ ЧАРТА RFI-MOS)
 #  Канонизирован под формат hand_key: старшая карта первой (A9o, KQo и т.п.)
@@ -116,19 +131,30 @@ def _get_suit(card: str) -> str:
     return card[1].lower()
 
 
-def normalize_hand_key(hero_cards: List[str]) -> str:
-    """
-    Приводит 2 карты героя к каноничному виду:
-    - пара: "77", "AA"
-    - разные ранги:
-        - suited:   "AKs"
-        - offsuit:  "AKo"
+# Карта "Ah" -> код (rank_index << 2) | suit_index, включая варианты регистра
+_SUITS = "cdhs"
+_CARD_TO_CODE: Dict[str, int] = {
+    rv + sv: (ri << 2) | si
+    for ri, r in enumerate(RANKS)
+    for si, s in enumerate(_SUITS)
+    for rv in {r, r.lower()}
+    for sv in {s, s.upper()}
+}
+
+# Все 169 каноничных ключей по индексу (hi * 13 + lo) * 2 + suited
+_KEY_TABLE: List[str] = [""] * (13 * 13 * 2)
+for _hi in range(13):
+    for _lo in range(_hi + 1):
+        for _suited in (0, 1):
+            if _hi == _lo:
+                _key = RANKS[_hi] * 2
+            else:
+                _key = RANKS[_hi] + RANKS[_lo] + ("s" if _suited else "o")
+            _KEY_TABLE[(_hi * 13 + _lo) * 2 + _suited] = _key
+del _hi, _lo, _suited, _key
 
-    hero_cards: ["Td", "5h"], ["Ah", "Ad"], etc.
-    """
-    if len(hero_cards) != 2:
-        raise ValueError(f"Ожидалось ровно 2 карты героя, получено: {hero_cards!r}")
 
+def _normalize_hand_key_slow(hero_cards: List[str]) -> str:
     c1, c2 = hero_cards
     r1, s1 = _get_rank(c1), _get_suit(c1)
     r2, s2 = _get_rank(c2), _get_suit(c2)
@@ -152,6 +178,31 @@ def normalize_hand_key(hero_cards: List[str]) -> str:
     return f"{high}{low}{'s' if suited else 'o'}"
 
 
+def normalize_hand_key(hero_cards: List[str]) -> str:
+    """
+    Приводит 2 карты героя к каноничному виду:
+    - пара: "77", "AA"
+    - разные ранги:
+        - suited:   "AKs"
+        - offsuit:  "AKo"
+
+    hero_cards: ["Td", "5h"], ["Ah", "Ad"], etc.
+    """
+    if len(hero_cards) != 2:
+        raise ValueError(f"Ожидалось ровно 2 карты героя, получено: {hero_cards!r}")
+
+    c1, c2 = hero_cards
+    a = _CARD_TO_CODE.get(c1)
+    b = _CARD_TO_CODE.get(c2)
+    if a is None or b is None:
+        # нестандартная запись карты — старый разбор (с его ошибками)
+        return _normalize_hand_key_slow(hero_cards)
+
+    if a < b:
+        a, b = b, a
+    return _KEY_TABLE[((a >> 2) * 13 + (b >> 2)) * 2 + ((a & 3) == (b & 3))]
+
+
 # ---------------------------------------------------------------------
 #  MOS-ЛОГИКА: МИНИМАЛЬНАЯ ПОЗИЦИЯ ОТКРЫТИЯ
 # ---------------------------------------------------------------------
@@ -164,7 +215,15 @@ def get_mos_min_position(hand_key: str) -> Optional[str]:
     return mos_min_position(hand_key)
 
 
-def _classify_hand_category_from_mos(hand_key: str) -> tuple[str, float, Optional[str], str]:
+class _HandClass(NamedTuple):
+    category: str
+    strength_score: float
+    mos_pos: Optional[str]
+    notes: str
+
+
+@lru_cache(maxsize=256)
+def _classify_hand_category_from_mos(hand_key: str) -> _HandClass:
     """
     На основе MOS-диапазонов:
       - определяем минимальную позицию открытия,
@@ -182,7 +241,7 @@ def _classify_hand_category_from_mos(hand_key: str) -> tuple[str, float, Optiona
             f"В базовой стратегии такая рука чаще всего фолдится префлоп "
             f"или играет только как защита против открытия."
         )
-        return category, strength_score, None, notes
+        return _HandClass(category, strength_score, None, notes)
 
     if mos_pos == "EP":
         category = "premium"
@@ -213,7 +272,7 @@ def _classify_hand_category_from_mos(hand_key: str) -> tuple[str, float, Optiona
             f"Это более спекулятивная рука, которая открывается в основном с поздних позиций."
         )
 
-    return category, strength_score, mos_pos, notes
+    return _HandClass(category, strength_score, mos_pos, notes)
 
 
 # ---------------------------------------------------------------------
@@ -221,6 +280,49 @@ def _classify_hand_category_from_mos(hand_key: str) -> tuple[str, float, Optiona
 # ---------------------------------------------------------------------
 
 
+# Базовая карта "категория → примерная equity".
+# Это НЕ точные цифры по солверу, а калиброванная шкала
+# специально под твою MOS-систему:
+#
+# premium     ~ 0.68
+# strong      ~ 0.60
+# medium      ~ 0.56
+# speculative ~ 0.52
+# trash       ~ 0.47
+#
+BASE_EQUITY_BY_CATEGORY: Dict[str, float] = {
+    "premium": 0.68,
+    "strong": 0.60,
+    "medium": 0.56,
+    "speculative": 0.52,
+    "trash": 0.47,
+}
+
+
+@lru_cache(maxsize=2048)
+def _estimate_core(hand_key: str) -> Tuple[str, float, float, Optional[str], str]:
+    """
+    Часть оценки, зависящая только от hand_key (позиции в расчёт не входят).
+    Каноничных рук всего 169, поэтому результат кешируется:
+    (category, strength_score, estimated_equity, mos_min_position, notes).
+    """
+    hc = _classify_hand_category_from_mos(hand_key)
+    strength_score = hc.strength_score
+
+    base_equity = BASE_EQUITY_BY_CATEGORY.get(hc.category, 0.50)
+
+    # Чуть подмешаем strength_score, чтобы внутри категории были микродвижения.
+    # Делаем небольшую поправку ±0.03 вокруг базового значения.
+    # Это можно будет потом затюнить по ощущениям/данным.
+    delta = (strength_score - 0.7) * 0.08  # маленький коэффициент
+    estimated_equity = base_equity + delta
+
+    # ограничим интервал [0.35, 0.80] на всякий случай
+    estimated_equity = max(0.35, min(0.80, estimated_equity))
+
+    return hc.category, round(strength_score, 3), round(estimated_equity, 3), hc.mos_pos, hc.notes
+
+
 def estimate_preflop_equity_vs_unknown_range(
     hero_cards: List[str],
     hero_position: Optional[str] = None,
@@ -243,42 +345,13 @@ def estimate_preflop_equity_vs_unknown_range(
     - внешний hand/equity-движок.
     """
     hand_key = normalize_hand_key(hero_cards)
-    category, strength_score, mos_pos, notes = _classify_hand_category_from_mos(hand_key)
-
-    # Базовая карта "категория → примерная equity".
-    # Это НЕ точные цифры по солверу, а калиброванная шкала
-    # специально под твою MOS-систему:
-    #
-    # premium     ~ 0.68
-    # strong      ~ 0.60
-    # medium      ~ 0.56
-    # speculative ~ 0.52
-    # trash       ~ 0.47
-    #
-    base_equity_by_category: Dict[str, float] = {
-        "premium": 0.68,
-        "strong": 0.60,
-        "medium": 0.56,
-        "speculative": 0.52,
-        "trash": 0.47,
-    }
-
-    base_equity = base_equity_by_category.get(category, 0.50)
-
-    # Чуть подмешаем strength_score, чтобы внутри категории были микродвижения.
-    # Делаем небольшую поправку ±0.03 вокруг базового значения.
-    # Это можно будет потом затюнить по ощущениям/данным.
-    delta = (strength_score - 0.7) * 0.08  # маленький коэффициент
-    estimated_equity = base_equity + delta
-
-    # ограничим интервал [0.35, 0.80] на всякий случай
-    estimated_equity = max(0.35, min(0.80, estimated_equity))
+    category, strength_score, estimated_equity, mos_pos, notes = _estimate_core(hand_key)
 
     return PreflopEquityEstimate(
         hand_key=hand_key,
         category=category,
-        strength_score=round(strength_score, 3),
-        estimated_equity_vs_unknown=round(estimated_equity, 3),
+        strength_score=strength_score,
+        estimated_equity_vs_unknown=estimated_equity,
         hero_position=hero_position,
         villain_position=villain_position,
         mos_min_position=mos_pos,
@@ -318,4 +391,4 @@ def estimate_preflop_equity_as_dict(
         hero_position=hero_position,
         villain_position=villain_position,
     )
-    return asdict(estimate)
+    return _estimate_to_dict(estimate)
@@ -16,6 +16,16 @@ def ev_fold() -> float:
     return 0.0
 
 
+def _ev_call_core(pb: float, inv: float, e: float) -> float:
+    # аргументы — уже float, equity уже в [0, 1]
+    return e * (pb + inv) - inv
+
+
+def _ev_bet_core(pb: float, inv: float, e: float, fe: float, final_pot: float) -> float:
+    # аргументы — уже float, equity и FE уже в [0, 1]
+    return fe * pb + (1.0 - fe) * (e * final_pot - inv)
+
+
 def ev_call_check(pot_before: float, investment: float, equity: float) -> float:
     """
     EV колла (или чека, если investment=0).
@@ -24,7 +34,7 @@ def ev_call_check(pot_before: float, investment: float, equity: float) -> float:
     pb = float(pot_before)
     inv = float(investment)
     e = _clamp01(float(equity))
-    return e * (pb + inv) - inv
+    return _ev_call_core(pb, inv, e)
 
 
 def ev_bet_raise(
@@ -51,7 +61,26 @@ def ev_bet_raise(
     else:
         final_pot = float(final_pot_if_called)
 
-    return fe * pb + (1.0 - fe) * (e * final_pot - inv)
+    return _ev_bet_core(pb, inv, e, fe, final_pot)
+
+
+# action_kind (в нижнем регистре) -> код ветки v1; всё остальное — неизвестное действие
+_AK_FOLD = 0
+_AK_CHECK = 1
+_AK_CALL = 2
+_AK_BET_RAISE = 3
+_AK_CODE: Dict[str, int] = {
+    "fold": _AK_FOLD,
+    "check": _AK_CHECK,
+    "call": _AK_CALL,
+    "bet": _AK_BET_RAISE,
+    "raise": _AK_BET_RAISE,
+    "3bet": _AK_BET_RAISE,
+    "4bet": _AK_BET_RAISE,
+    "allin": _AK_BET_RAISE,
+    "all-in": _AK_BET_RAISE,
+    "jam": _AK_BET_RAISE,
+}
 
 
 def generate_assumptions(street: str, action_kind: str, context: Optional[Dict[str, Any]] = None) -> str:
@@ -120,8 +149,10 @@ def _make_ev_estimate(
     - Legacy ключ: ev (число)  <-- чтобы старые репорты/код не умерли
     - Новый label: ev_action_label (строка)
     - Legacy string: ev_action_str (строка) <-- если где-то раньше ожидали строку в ev_action
+
+    ev_value и confidence приходят уже float (их приводит compute_ev_estimate_v1).
     """
-    ev_num = float(ev_value)
+    ev_num = ev_value
 
     return {
         "street": street,
@@ -140,7 +171,7 @@ def _make_ev_estimate(
         "final_pot_if_called": final_pot_if_called,
         "model": model,
         "assumptions": assumptions,
-        "confidence": float(confidence),
+        "confidence": confidence,
         "context": context,
         "alternatives": alternatives,
         "explanation": explanation,
@@ -172,7 +203,13 @@ def compute_ev_estimate_v1(
     - если вызвали со старым именем ev_action=... (строка), не ломаемся
     - возвращаем и новый ключ ev_action (число), и legacy ev (число)
     """
-    ak = (action_kind or "unknown").lower()
+    # парсер отдаёт action_kind уже в нижнем регистре — тогда lower() не нужен
+    if action_kind in _AK_CODE:
+        ak = action_kind
+        code = _AK_CODE[ak]
+    else:
+        ak = (action_kind or "unknown").lower()
+        code = _AK_CODE.get(ak, -1)
     ctx = context or {}
     alts = alternatives or {}
 
@@ -202,7 +239,7 @@ def compute_ev_estimate_v1(
     eq = _clamp01(float(estimated_equity))
 
     # пассивные действия без вложений
-    if investment is None and ak in ("check", "fold"):
+    if investment is None and (code == _AK_CHECK or code == _AK_FOLD):
         return _make_ev_estimate(
             street=street,
             action_kind=action_kind,
@@ -244,7 +281,7 @@ def compute_ev_estimate_v1(
     inv = float(investment)
 
     # fold
-    if ak == "fold":
+    if code == _AK_FOLD:
         return _make_ev_estimate(
             street=street,
             action_kind=action_kind,
@@ -264,8 +301,8 @@ def compute_ev_estimate_v1(
         )
 
     # call / check
-    if ak in ("call", "check"):
-        ev_value = ev_call_check(pb, inv, eq)
+    if code == _AK_CALL or code == _AK_CHECK:
+        ev_value = _ev_call_core(pb, inv, eq)
         used_label = label
         if used_label == "unlabeled":
             used_label = "check" if inv == 0.0 else "call"
@@ -289,15 +326,10 @@ def compute_ev_estimate_v1(
         )
 
     # bet/raise/3bet/4bet/allin
-    if ak in ("bet", "raise", "3bet", "4bet", "allin", "all-in", "jam"):
+    if code == _AK_BET_RAISE:
         fe = 0.0 if fold_equity is None else _clamp01(float(fold_equity))
-        ev_value = ev_bet_raise(
-            pot_before=pb,
-            investment=inv,
-            equity_if_called=eq,
-            fold_equity=fe,
-            final_pot_if_called=final_pot_if_called,
-        )
+        final_pot = pb + 2.0 * inv if final_pot_if_called is None else float(final_pot_if_called)
+        ev_value = _ev_bet_core(pb, inv, eq, fe, final_pot)
         used_label = label if label != "unlabeled" else f"{ak}_default"
         return _make_ev_estimate(
             street=street,
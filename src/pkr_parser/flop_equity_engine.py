@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 
 def _clamp(value: float, min_value: float = 0.05, max_value: float = 0.95) -> float:
@@ -12,66 +12,46 @@ def _clamp(value: float, min_value: float = 0.05, max_value: float = 0.95) -> fl
     return value
 
 
-def estimate_flop_equity_simple(
-    category: Optional[str],
-    pair_kind: Optional[str],
-    strength_score: Optional[float],
+# категории с отдельной поправкой; всё остальное — общий ключ None
+_CATEGORY_CLASS: Dict[str, str] = {
+    "high_card": "high_card",
+    "set": "set_plus",
+    "full_house": "set_plus",
+    "quads": "set_plus",
+    "straight_flush": "set_plus",
+}
+_ROLE_KEYS = ("aggressor", "caller")
+
+
+def _flop_adjustments(
+    category_class: Optional[str],
+    board_pair: bool,
     multiway: bool,
     hero_ip: bool,
-    preflop_role: str,
-) -> Optional[Dict[str, Any]]:
+    preflop_role: Optional[str],
+) -> Tuple[Tuple[float, ...], str]:
     """
-    Очень грубая оценка equity героя на флопе против диапазона оппонента.
-
-    ВХОД:
-      - category: high_card / pair / two_pair / set / straight / flush / ...
-      - pair_kind: top_pair / overpair / middle_pair / bottom_pair / board_pair / None
-      - strength_score: 0..1 (наша внутренняя шкала силы руки на флопе)
-      - multiway: True, если мультипот
-      - hero_ip: True, если герой в позиции на флопе
-      - preflop_role: aggressor / caller / checked_bb / ...
-
-    ВЫХОД:
-      {
-        "estimated_equity": float (0..1),
-        "model": "simple_flop_category_model",
-        "explanation": str
-      }
-
-    Это НЕ солвер и НЕ точная equity, а приближённая модель на основе категории руки и контекста.
+    Контекстные поправки к базовой equity: (поправки по порядку, текст объяснения после базовой фразы).
+    Вызывается только при импорте для заполнения _FLOP_ADJUSTMENTS.
     """
-
-    if category is None or strength_score is None:
-        return None
-
-    # Базовая линейка: переводим strength_score (0..1) в "более полярную" equity вокруг 0.5
-    #  - сильные руки чуть приближаем к 0.8–0.9
-    #  - слабые — к 0.1–0.2
-    base_equity = 0.5 + (strength_score - 0.5) * 1.3
-    base_equity = _clamp(base_equity, 0.08, 0.92)
-
-    explanation_parts = []
-
-    explanation_parts.append(
-        f"Базовая оценка equity построена от strength_score={strength_score:.2f} "
-        f"и категории руки на флопе ({category})."
-    )
+    deltas: List[float] = []
+    explanation_parts: List[str] = []
 
     # Коррекция за мультивей
     if multiway:
-        base_equity -= 0.07
+        deltas.append(-0.07)
         explanation_parts.append(
             "Мультипот (несколько оппонентов) снижает твою equity примерно на 7 п.п."
         )
 
     # Коррекция за позицию
     if not hero_ip:
-        base_equity -= 0.03
+        deltas.append(-0.03)
         explanation_parts.append(
             "Игра без позиции (OOP) снижает эффективную equity примерно на 3 п.п."
         )
     else:
-        base_equity += 0.02
+        deltas.append(0.02)
         explanation_parts.append(
             "Игра в позиции (IP) слегка повышает эффективную equity (около 2 п.п.)."
         )
@@ -79,41 +59,114 @@ def estimate_flop_equity_simple(
     # Роль префлоп
     if preflop_role == "aggressor":
         # Как префлоп-агрессор, у тебя априори более сильный диапазон
-        base_equity += 0.02
+        deltas.append(0.02)
         explanation_parts.append(
             "Ты префлоп-агрессор, поэтому твой диапазон в среднем сильнее — добавляем около 2 п.п. equity."
         )
     elif preflop_role == "caller":
-        base_equity -= 0.01
+        deltas.append(-0.01)
         explanation_parts.append(
             "Ты префлоп-коллер, твой диапазон слегка слабее диапазона агрессора — вычитаем около 1 п.п. equity."
         )
 
     # Специальные поправки для некоторых категорий
     # high_card: обычно переоценён, чуть режем
-    if category == "high_card":
-        base_equity -= 0.05
+    if category_class == "high_card":
+        deltas.append(-0.05)
         explanation_parts.append(
             "Рука без попадания (high_card) редко хорошо реализует equity — дополнительно уменьшаем оценку."
         )
 
     # board_pair: твоя пара только на доске => твой SDV слабый
-    if pair_kind == "board_pair":
-        base_equity -= 0.03
+    if board_pair:
+        deltas.append(-0.03)
         explanation_parts.append(
             "Пара полностью на борде (board_pair), твой showdown value слабый — ещё немного снижаем equity."
         )
 
     # set+, наоборот, чуть апаем
-    if category in ("set", "full_house", "quads", "straight_flush"):
-        base_equity += 0.03
+    if category_class == "set_plus":
+        deltas.append(0.03)
         explanation_parts.append(
             "Очень сильная made-hand (set+) — слегка повышаем оценку equity."
         )
 
+    return tuple(deltas), "".join(" " + part for part in explanation_parts)
+
+
+# Все комбинации контекста дискретны → поправки и текст объяснения считаем один раз
+_FLOP_ADJUSTMENTS: Dict[tuple, Tuple[Tuple[float, ...], str]] = {
+    (cc, bp, mw, ip, role): _flop_adjustments(cc, bp, mw, ip, role)
+    for cc in ("high_card", "set_plus", None)
+    for bp in (False, True)
+    for mw in (False, True)
+    for ip in (False, True)
+    for role in _ROLE_KEYS + (None,)
+}
+
+
+def estimate_flop_equity_simple(
+    category: Optional[str],
+    pair_kind: Optional[str],
+    strength_score: Optional[float],
+    multiway: bool,
+    hero_ip: bool,
+    preflop_role: str,
+    include_explanation: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    Очень грубая оценка equity героя на флопе против диапазона оппонента.
+
+    ВХОД:
+      - category: high_card / pair / two_pair / set / straight / flush / ...
+      - pair_kind: top_pair / overpair / middle_pair / bottom_pair / board_pair / None
+      - strength_score: 0..1 (наша внутренняя шкала силы руки на флопе)
+      - multiway: True, если мультипот
+      - hero_ip: True, если герой в позиции на флопе
+      - preflop_role: aggressor / caller / checked_bb / ...
+      - include_explanation: False — не собирать текст explanation (будет "")
+
+    ВЫХОД:
+      {
+        "estimated_equity": float (0..1),
+        "model": "simple_flop_category_model",
+        "explanation": str
+      }
+
+    Это НЕ солвер и НЕ точная equity, а приближённая модель на основе категории руки и контекста.
+    """
+
+    if category is None or strength_score is None:
+        return None
+
+    # Базовая линейка: переводим strength_score (0..1) в "более полярную" equity вокруг 0.5
+    #  - сильные руки чуть приближаем к 0.8–0.9
+    #  - слабые — к 0.1–0.2
+    base_equity = 0.5 + (strength_score - 0.5) * 1.3
+    base_equity = _clamp(base_equity, 0.08, 0.92)
+
+    key = (
+        _CATEGORY_CLASS.get(category),
+        pair_kind == "board_pair",
+        bool(multiway),
+        bool(hero_ip),
+        preflop_role if preflop_role in _ROLE_KEYS else None,
+    )
+    deltas, tail = _FLOP_ADJUSTMENTS[key]
+
+    # поправки применяем по одной, в том же порядке, что и в _flop_adjustments
+    for d in deltas:
+        base_equity += d
+
     estimated_equity = _clamp(base_equity, 0.05, 0.95)
 
-    explanation = " ".join(explanation_parts)
+    if include_explanation:
+        explanation = (
+            f"Базовая оценка equity построена от strength_score={strength_score:.2f} "
+            f"и категории руки на флопе ({category})."
+        ) + tail
+    else:
+        explanation = ""
 
     return {
         "estimated_equity": float(f"{estimated_equity:.3f}"),
@@ -122,10 +175,7 @@ def estimate_flop_equity_simple(
     }
 
 
-def get_flop_ev_action(action_type: str, hero_ip: bool, multiway: bool) -> str:
-    """
-    Возвращает конкретное действие контекста для флопа.
-    """
+def _flop_ev_action_label(action_type: str, hero_ip: bool, multiway: bool) -> str:
     if action_type == "bet_vs_check":
         if hero_ip:
             return "cbet_ip" if not multiway else "cbet_multiway_ip"
@@ -148,3 +198,19 @@ def get_flop_ev_action(action_type: str, hero_ip: bool, multiway: bool) -> str:
             return "raise_value_oop" if not multiway else "raise_value_multiway_oop"
     else:
         return action_type
+
+
+# 4 типа действий × IP/OOP × HU/мультивей — все лейблы известны заранее
+_FLOP_EV_ACTION: Dict[Tuple[str, bool, bool], str] = {
+    (at, ip, mw): _flop_ev_action_label(at, ip, mw)
+    for at in ("bet_vs_check", "check", "call_vs_bet", "raise_vs_bet")
+    for ip in (False, True)
+    for mw in (False, True)
+}
+
+
+def get_flop_ev_action(action_type: str, hero_ip: bool, multiway: bool) -> str:
+    """
+    Возвращает конкретное действие контекста для флопа.
+    """
+    return _FLOP_EV_ACTION.get((action_type, bool(hero_ip), bool(multiway)), action_type)
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import json
 import re
+import sys
 
 from .equity_engine import estimate_preflop_equity_as_dict
 from .decision_engine import evaluate_preflop_decision
@@ -19,7 +20,7 @@ from .ev_tools import compute_ev_estimate_v1, generate_assumptions
 # ---------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     seat: int
     name: str
@@ -27,7 +28,7 @@ class Player:
     position: Optional[str] = None  # BTN / SB / BB / UTG / MP / CO
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     street: str          # preflop / flop / turn / river
     player: str
@@ -40,13 +41,13 @@ class Action:
     pct_pot: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Winner:
     player: str
     amount: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ShowdownEntry:
     player: str
     cards: List[str]
@@ -55,7 +56,7 @@ class ShowdownEntry:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HeroPreflopAnalysis:
     action_type: Optional[str]
     was_first_in: Optional[bool]
@@ -66,7 +67,7 @@ class HeroPreflopAnalysis:
     effective_stack_bb: Optional[float]
 
 
-@dataclass
+@dataclass(slots=True)
 class Hand:
     id: int
 
@@ -121,6 +122,81 @@ class Hand:
 
 
 
+# ---------------------------------------------------------------------
+#  РЕГУЛЯРКИ (компилируются один раз при импорте)
+# ---------------------------------------------------------------------
+
+
+_AMOUNT_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+_HEADER_RE = re.compile(
+    r"Poker Hand #(?P<hand_id>\S+):\s*(?P<game_type>.+?)\s*"
+    r"\((?P<stakes>[^)]*)\)\s*-\s*"
+    r"(?P<date>\d{4}/\d{2}/\d{2})\s+"
+    r"(?P<time>\d{2}:\d{2}:\d{2})(?:\s+\S+)?"
+)
+_STAKES_RE = re.compile(r"(?P<c1>[$€£]?)(?P<sb>[0-9.]+)\s*/\s*(?P<c2>[$€£]?)(?P<bb>[0-9.]+)")
+_TABLE_RE = re.compile(r"Table '(.+?)'\s+(\d+)-max Seat #(\d+) is the button")
+
+_SEAT_RE = re.compile(r"Seat\s+(\d+):\s+(.+?)\s+\(\$([0-9.]+)\s+in chips\)", re.IGNORECASE)
+
+_HERO_DEAL_RE = re.compile(r"Dealt to (\S+) \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\]")
+
+_UNCALLED_RE = re.compile(r"Uncalled bet \(\$([0-9.]+)\) returned to (.+)")
+_PREFIX_RE = re.compile(r"([^:]+):\s+(.*)")
+# одно чередование вместо каскада match'ей; альтернативы пробуются в том же порядке,
+# имя сработавшей группы (m.lastgroup) — тип действия, в группе — сумма
+_ACTION_RE = re.compile(
+    r"posts small blind \$(?P<post_sb>[0-9.]+)"
+    r"|posts big blind \$(?P<post_bb>[0-9.]+)"
+    r"|raises \$[0-9.]+ to \$(?P<raise>[0-9.]+)"
+    r"|bets \$(?P<bet>[0-9.]+)"
+    r"|calls \$(?P<call>[0-9.]+)"
+    r"|(?P<check>checks)"
+    r"|(?P<fold>folds)",
+    re.IGNORECASE,
+)
+_ACTION_WITH_AMOUNT = frozenset(("post_sb", "post_bb", "raise", "bet", "call"))
+
+# наборы типов действий для проверок в горячих циклах
+_SKIP_ACTIONS = frozenset(("uncalled", "post_sb", "post_bb"))       # не добровольные действия
+_POT_ADDING_ACTIONS = frozenset(("post_sb", "post_bb", "bet", "call"))
+_AGGRESSIVE_ACTIONS = frozenset(("bet", "raise"))
+_DECISION_ACTION_KINDS = frozenset(("call", "raise", "fold", "check", "bet"))
+
+_FLOP_RE = re.compile(r"\*\*\* FLOP \*\*\* \[(.*?)\]", re.IGNORECASE)
+_TURN_RE = re.compile(r"\*\*\* TURN \*\*\*.*?\[(.*?)\]", re.IGNORECASE)
+_RIVER_RE = re.compile(r"\*\*\* RIVER \*\*\*.*?\[(.*?)\]", re.IGNORECASE)
+_BOARD_RE = re.compile(r"Board \[([2-9TJQKAcdhs\s]+)\]")
+
+_TOTAL_POT_RAKE_RE = re.compile(r"Total pot \$([0-9.]+)\s*\|\s*Rake \$([0-9.]+)", re.IGNORECASE)
+_TOTAL_POT_RE = re.compile(r"Total pot \$([0-9.]+)", re.IGNORECASE)
+_RAKE_RE = re.compile(r"Rake \$([0-9.]+)", re.IGNORECASE)
+
+_COLLECTED_BODY_RE = re.compile(
+    r"^(.+?) collected \$([0-9.]+) from pot",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WON_SUMMARY_RE = re.compile(
+    r"^Seat \d+: (.+?) .* won \(\$([0-9.]+)\)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_COLLECTED_SUMMARY_RE = re.compile(
+    r"^Seat \d+: (.+?) .* collected \(\$([0-9.]+)\)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_SHOWS_RE = re.compile(
+    r"^(.+?): shows \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\](?: \((.+)\))?",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SHOWED_SEAT_RE = re.compile(
+    r"^Seat \d+: (.+?) .*showed \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\]"
+    r"(?: and (won|lost)(?: \(\$([0-9.]+)\))?)?(?: with (.+))?",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
 # ---------------------------------------------------------------------
 #  ОБЩИЕ ХЕЛПЕРЫ
 # ---------------------------------------------------------------------
@@ -129,7 +205,7 @@ class Hand:
 def parse_amount(raw: str) -> Optional[float]:
     if raw is None:
         return None
-    m = re.search(r"[-+]?\d+(?:\.\d+)?", raw)
+    m = _AMOUNT_RE.search(raw)
     if not m:
         return None
     try:
@@ -138,29 +214,53 @@ def parse_amount(raw: str) -> Optional[float]:
         return None
 
 
-def split_into_hands(text: str) -> List[str]:
-    lines = text.splitlines()
-    hands: List[str] = []
+def _to_float(raw: str) -> Optional[float]:
+    """
+    Быстрый путь для уже захваченных групп вида [0-9.]+ — без повторного regex-поиска.
+    Всё, что float() не съест как есть (".5", "1.2.3"), уходит в parse_amount,
+    чтобы результат совпадал с ним.
+    """
+    if raw and raw[0] != ".":
+        try:
+            return float(raw)
+        except ValueError:
+            pass
+    return parse_amount(raw)
+
+
+def _iter_hand_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """Раздачи — блоки непустых строк, разделённые пустыми строками."""
     current: List[str] = []
 
     for line in lines:
         if line.strip() == "":
             if current:
-                hands.append("\n".join(current))
+                yield "\n".join(current)
                 current = []
         else:
             current.append(line)
 
     if current:
-        hands.append("\n".join(current))
+        yield "\n".join(current)
+
+
+def split_into_hands(text: str) -> List[str]:
+    return list(_iter_hand_blocks(text.splitlines()))
+
 
-    return hands
+def iter_hands(path: str | Path) -> Iterator[str]:
+    """
+    Потоковый вариант load_and_split: читает файл построчно и отдаёт раздачи по одной,
+    не держа в памяти весь текст истории. Разбиение то же, что у split_into_hands.
+    """
+    with Path(path).open(encoding="utf-8") as f:
+        # splitlines() на каждой физической строке — чтобы \x85, \u2028 и т.п.
+        # резали строки так же, как text.splitlines() в split_into_hands
+        yield from _iter_hand_blocks(sub for raw in f for sub in raw.splitlines())
 
 
 def load_and_split(path: str | Path) -> List[str]:
-    file_path = Path(path)
-    raw_text = file_path.read_text(encoding="utf-8")
-    return split_into_hands(raw_text)
+    return list(iter_hands(path))
 
 
 # ---------------------------------------------------------------------
@@ -168,7 +268,7 @@ def load_and_split(path: str | Path) -> List[str]:
 # ---------------------------------------------------------------------
 
 
-def parse_hand_header(hand_text: str):
+def parse_hand_header(hand_text: str, lines: Optional[List[str]] = None):
     hand_id = None
     game_type = None
     currency = None
@@ -180,7 +280,8 @@ def parse_hand_header(hand_text: str):
     max_players: Optional[int] = None
     button_seat: Optional[int] = None
 
-    lines = hand_text.splitlines()
+    if lines is None:
+        lines = hand_text.splitlines()
 
     header_line = None
     for line in lines:
@@ -189,13 +290,7 @@ def parse_hand_header(hand_text: str):
             break
 
     if header_line:
-        m = re.search(
-            r"Poker Hand #(?P<hand_id>\S+):\s*(?P<game_type>.+?)\s*"
-            r"\((?P<stakes>[^)]*)\)\s*-\s*"
-            r"(?P<date>\d{4}/\d{2}/\d{2})\s+"
-            r"(?P<time>\d{2}:\d{2}:\d{2})(?:\s+\S+)?",
-            header_line,
-        )
+        m = _HEADER_RE.search(header_line)
         if m:
             hand_id = m.group("hand_id")
             game_type = m.group("game_type").strip()
@@ -203,15 +298,12 @@ def parse_hand_header(hand_text: str):
             date = m.group("date")
             time = m.group("time")
 
-            stakes_match = re.search(
-                r"(?P<c1>[$€£]?)(?P<sb>[0-9.]+)\s*/\s*(?P<c2>[$€£]?)(?P<bb>[0-9.]+)",
-                stakes,
-            )
+            stakes_match = _STAKES_RE.search(stakes)
             if stakes_match:
                 c1 = stakes_match.group("c1") or stakes_match.group("c2") or "$"
                 currency = c1
-                sb = parse_amount(stakes_match.group("sb"))
-                bb = parse_amount(stakes_match.group("bb"))
+                sb = _to_float(stakes_match.group("sb"))
+                bb = _to_float(stakes_match.group("bb"))
 
     table_line = None
     for line in lines:
@@ -220,10 +312,7 @@ def parse_hand_header(hand_text: str):
             break
 
     if table_line:
-        m2 = re.match(
-            r"Table '(.+?)'\s+(\d+)-max Seat #(\d+) is the button",
-            table_line,
-        )
+        m2 = _TABLE_RE.match(table_line)
         if m2:
             table_name = m2.group(1)
             try:
@@ -243,22 +332,23 @@ def parse_hand_header(hand_text: str):
 # ---------------------------------------------------------------------
 
 
-def parse_players(hand_text: str) -> List[Player]:
+def parse_players(hand_text: str, lines: Optional[List[str]] = None) -> List[Player]:
     players: List[Player] = []
-    pattern = re.compile(
-        r"Seat\s+(\d+):\s+(.+?)\s+\(\$([0-9.]+)\s+in chips\)",
-        re.IGNORECASE,
-    )
 
-    for line in hand_text.splitlines():
-        m = pattern.match(line.strip())
+    if lines is None:
+        lines = hand_text.splitlines()
+
+    for line in lines:
+        m = _SEAT_RE.match(line.strip())
         if m:
             seat_str, name, stack_str = m.groups()
             seat = int(seat_str)
-            stack = parse_amount(stack_str)
+            stack = _to_float(stack_str)
             if stack is None:
                 continue
-            players.append(Player(seat=seat, name=name.strip(), stack=stack, position=None))
+            # имена интернируем здесь и в остальных парсерах: одно имя повторяется во всех
+            # Action/Winner/ShowdownEntry, а словари по игроку сравнивают ключи сначала по id
+            players.append(Player(seat=seat, name=sys.intern(name.strip()), stack=stack, position=None))
 
     return players
 
@@ -268,6 +358,18 @@ def parse_players(hand_text: str) -> List[Player]:
 # ---------------------------------------------------------------------
 
 
+# имена позиций по числу игроков за столом (от баттона по часовой)
+_POS_BY_N = (
+    (),
+    ("BTN",),
+    ("BTN", "BB"),
+    ("BTN", "SB", "BB"),
+    ("BTN", "SB", "BB", "UTG"),
+    ("BTN", "SB", "BB", "UTG", "MP"),
+    ("BTN", "SB", "BB", "UTG", "MP", "CO"),
+)
+
+
 def assign_positions(
     players: List[Player],
     button_seat: Optional[int],
@@ -282,34 +384,11 @@ def assign_positions(
     if button_seat not in seat_to_player:
         return players
 
-    ordered_seats: List[int] = []
-    current = button_seat
-    ordered_seats.append(current)
+    # порядок мест по часовой стрелке, начиная с баттона
+    idx = seats_sorted.index(button_seat)
+    ordered_seats = seats_sorted[idx:] + seats_sorted[:idx]
 
-    while len(ordered_seats) < len(seat_to_player):
-        bigger = [s for s in seats_sorted if s > current]
-        nxt = bigger[0] if bigger else seats_sorted[0]
-        if nxt in ordered_seats:
-            current = nxt
-            continue
-        ordered_seats.append(nxt)
-        current = nxt
-
-    n = len(ordered_seats)
-    if n == 1:
-        pos_names = ["BTN"]
-    elif n == 2:
-        pos_names = ["BTN", "BB"]
-    elif n == 3:
-        pos_names = ["BTN", "SB", "BB"]
-    elif n == 4:
-        pos_names = ["BTN", "SB", "BB", "UTG"]
-    elif n == 5:
-        pos_names = ["BTN", "SB", "BB", "UTG", "MP"]
-    else:
-        pos_names = ["BTN", "SB", "BB", "UTG", "MP", "CO"]
-
-    pos_names = pos_names[:n]
+    pos_names = _POS_BY_N[min(len(ordered_seats), 6)]
 
     for seat, pos in zip(ordered_seats, pos_names):
         seat_to_player[seat].position = pos
@@ -326,12 +405,9 @@ def parse_hero(hand_text: str) -> tuple[Optional[str], List[str]]:
     hero_name: Optional[str] = None
     hero_cards: List[str] = []
 
-    m = re.search(
-        r"Dealt to (\S+) \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\]",
-        hand_text,
-    )
+    m = _HERO_DEAL_RE.search(hand_text)
     if m:
-        hero_name = m.group(1)
+        hero_name = sys.intern(m.group(1))
         hero_cards = [m.group(2), m.group(3)]
         return hero_name, hero_cards
 
@@ -343,11 +419,12 @@ def parse_hero(hand_text: str) -> tuple[Optional[str], List[str]]:
 # ---------------------------------------------------------------------
 
 
-def parse_actions(hand_text: str) -> List[Action]:
+def parse_actions(hand_text: str, lines: Optional[List[str]] = None) -> List[Action]:
     actions: List[Action] = []
 
     street = "preflop"
-    lines = hand_text.splitlines()
+    if lines is None:
+        lines = hand_text.splitlines()
 
     for line in lines:
         line = line.rstrip("\n")
@@ -364,57 +441,25 @@ def parse_actions(hand_text: str) -> List[Action]:
                 street = "river"
             continue
 
-        m = re.match(r"Uncalled bet \(\$([0-9.]+)\) returned to (.+)", line)
+        m = _UNCALLED_RE.match(line)
         if m:
-            amount = parse_amount(m.group(1))
-            player = m.group(2).strip()
+            amount = _to_float(m.group(1))
+            player = sys.intern(m.group(2).strip())
             actions.append(Action(street=street, player=player, action="uncalled", amount=amount))
             continue
 
-        m_prefix = re.match(r"([^:]+):\s+(.*)", line)
+        m_prefix = _PREFIX_RE.match(line)
         if not m_prefix:
             continue
 
-        player = m_prefix.group(1).strip()
+        player = sys.intern(m_prefix.group(1).strip())
         rest = m_prefix.group(2).strip()
 
-        m = re.match(r"posts small blind \$([0-9.]+)", rest, re.IGNORECASE)
-        if m:
-            amount = parse_amount(m.group(1))
-            actions.append(Action(street=street, player=player, action="post_sb", amount=amount))
-            continue
-
-        m = re.match(r"posts big blind \$([0-9.]+)", rest, re.IGNORECASE)
-        if m:
-            amount = parse_amount(m.group(1))
-            actions.append(Action(street=street, player=player, action="post_bb", amount=amount))
-            continue
-
-        m = re.match(r"raises \$([0-9.]+) to \$([0-9.]+)", rest, re.IGNORECASE)
-        if m:
-            amount_to = parse_amount(m.group(2))
-            actions.append(Action(street=street, player=player, action="raise", amount=amount_to))
-            continue
-
-        m = re.match(r"bets \$([0-9.]+)", rest, re.IGNORECASE)
-        if m:
-            amount = parse_amount(m.group(1))
-            actions.append(Action(street=street, player=player, action="bet", amount=amount))
-            continue
-
-        m = re.match(r"calls \$([0-9.]+)", rest, re.IGNORECASE)
+        m = _ACTION_RE.match(rest)
         if m:
-            amount = parse_amount(m.group(1))
-            actions.append(Action(street=street, player=player, action="call", amount=amount))
-            continue
-
-        if re.match(r"checks", rest, re.IGNORECASE):
-            actions.append(Action(street=street, player=player, action="check", amount=None))
-            continue
-
-        if re.match(r"folds", rest, re.IGNORECASE):
-            actions.append(Action(street=street, player=player, action="fold", amount=None))
-            continue
+            kind = m.lastgroup
+            amount = _to_float(m.group(kind)) if kind in _ACTION_WITH_AMOUNT else None
+            actions.append(Action(street=street, player=player, action=kind, amount=amount))
 
     return actions
 
@@ -427,25 +472,25 @@ def parse_actions(hand_text: str) -> List[Action]:
 def parse_board(hand_text: str) -> List[str]:
     board: List[str] = []
 
-    flop = re.search(r"\*\*\* FLOP \*\*\* \[(.*?)\]", hand_text, re.IGNORECASE)
+    flop = _FLOP_RE.search(hand_text)
     if flop:
         cards = flop.group(1).split()
         board += cards[:3]
 
-    turn = re.search(r"\*\*\* TURN \*\*\*.*?\[(.*?)\]", hand_text, re.IGNORECASE)
+    turn = _TURN_RE.search(hand_text)
     if turn:
         cards = turn.group(1).split()
         if cards:
             board.append(cards[-1])
 
-    river = re.search(r"\*\*\* RIVER \*\*\*.*?\[(.*?)\]", hand_text, re.IGNORECASE)
+    river = _RIVER_RE.search(hand_text)
     if river:
         cards = river.group(1).split()
         if cards:
             board.append(cards[-1])
 
     if not board:
-        m = re.search(r"Board \[([2-9TJQKAcdhs\s]+)\]", hand_text)
+        m = _BOARD_RE.search(hand_text)
         if m:
             board = m.group(1).split()
 
@@ -461,23 +506,19 @@ def parse_total_pot_and_rake(hand_text: str) -> tuple[Optional[float], Optional[
     total_pot = None
     rake = None
 
-    m = re.search(
-        r"Total pot \$([0-9.]+)\s*\|\s*Rake \$([0-9.]+)",
-        hand_text,
-        re.IGNORECASE,
-    )
+    m = _TOTAL_POT_RAKE_RE.search(hand_text)
     if m:
-        total_pot = parse_amount(m.group(1))
-        rake = parse_amount(m.group(2))
+        total_pot = _to_float(m.group(1))
+        rake = _to_float(m.group(2))
         return total_pot, rake
 
-    m2 = re.search(r"Total pot \$([0-9.]+)", hand_text, re.IGNORECASE)
+    m2 = _TOTAL_POT_RE.search(hand_text)
     if m2:
-        total_pot = parse_amount(m2.group(1))
+        total_pot = _to_float(m2.group(1))
 
-    m3 = re.search(r"Rake \$([0-9.]+)", hand_text, re.IGNORECASE)
+    m3 = _RAKE_RE.search(hand_text)
     if m3:
-        rake = parse_amount(m3.group(1))
+        rake = _to_float(m3.group(1))
 
     return total_pot, rake
 
@@ -490,36 +531,21 @@ def parse_total_pot_and_rake(hand_text: str) -> tuple[Optional[float], Optional[
 def parse_winners(hand_text: str) -> List[Winner]:
     winners: List[Winner] = []
 
-    pattern_collected_body = re.compile(
-        r"^(.+?) collected \$([0-9.]+) from pot",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    pattern_won_summary = re.compile(
-        r"^Seat \d+: (.+?) .* won \(\$([0-9.]+)\)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    pattern_collected_summary = re.compile(
-        r"^Seat \d+: (.+?) .* collected \(\$([0-9.]+)\)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    for m in pattern_collected_body.finditer(hand_text):
-        name = m.group(1).strip()
-        amount = parse_amount(m.group(2))
+    for m in _COLLECTED_BODY_RE.finditer(hand_text):
+        name = sys.intern(m.group(1).strip())
+        amount = _to_float(m.group(2))
         if amount is not None:
             winners.append(Winner(player=name, amount=amount))
 
-    for m in pattern_won_summary.finditer(hand_text):
-        name = m.group(1).strip()
-        amount = parse_amount(m.group(2))
+    for m in _WON_SUMMARY_RE.finditer(hand_text):
+        name = sys.intern(m.group(1).strip())
+        amount = _to_float(m.group(2))
         if amount is not None:
             winners.append(Winner(player=name, amount=amount))
 
-    for m in pattern_collected_summary.finditer(hand_text):
-        name = m.group(1).strip()
-        amount = parse_amount(m.group(2))
+    for m in _COLLECTED_SUMMARY_RE.finditer(hand_text):
+        name = sys.intern(m.group(1).strip())
+        amount = _to_float(m.group(2))
         if amount is not None:
             winners.append(Winner(player=name, amount=amount))
 
@@ -539,19 +565,8 @@ def parse_winners(hand_text: str) -> List[Winner]:
 def parse_showdown(hand_text: str) -> List[ShowdownEntry]:
     result: List[ShowdownEntry] = []
 
-    pattern_shows = re.compile(
-        r"^(.+?): shows \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\](?: \((.+)\))?",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    pattern_showed_seat = re.compile(
-        r"^Seat \d+: (.+?) .*showed \[([2-9TJQKA][cdhs]) ([2-9TJQKA][cdhs])\]"
-        r"(?: and (won|lost)(?: \(\$([0-9.]+)\))?)?(?: with (.+))?",
-        re.IGNORECASE | re.MULTILINE,
-    )
-
-    for m in pattern_shows.finditer(hand_text):
-        player = m.group(1).strip()
+    for m in _SHOWS_RE.finditer(hand_text):
+        player = sys.intern(m.group(1).strip())
         cards = [m.group(2), m.group(3)]
         desc = m.group(4)
         result.append(
@@ -564,11 +579,11 @@ def parse_showdown(hand_text: str) -> List[ShowdownEntry]:
             )
         )
 
-    for m in pattern_showed_seat.finditer(hand_text):
-        player = m.group(1).strip()
+    for m in _SHOWED_SEAT_RE.finditer(hand_text):
+        player = sys.intern(m.group(1).strip())
         cards = [m.group(2), m.group(3)]
         res = m.group(4)
-        won_amount = parse_amount(m.group(5)) if m.group(5) else None
+        won_amount = _to_float(m.group(5)) if m.group(5) else None
         desc = m.group(6)
         result.append(
             ShowdownEntry(
@@ -611,55 +626,48 @@ def annotate_actions_with_pot_and_bb(
     current_street = actions[0].street
     committed: Dict[str, float] = {}
 
-    def fix_street(street_name: str, pot_value: float):
-        if street_name == "preflop":
-            pots["preflop"] = pot_value
-        elif street_name == "flop":
-            pots["flop"] = pot_value
-        elif street_name == "turn":
-            pots["turn"] = pot_value
-        elif street_name == "river":
-            pots["river"] = pot_value
+    # bb и проверка bb > 0 не меняются внутри раздачи — считаем один раз
+    bb_ok = bool(big_blind) and big_blind > 0
 
     for act in actions:
-        if act.street != current_street:
-            fix_street(current_street, current_pot)
-            current_street = act.street
+        street = act.street
+        if street != current_street:
+            # фиксируем банк улицы (неизвестные улицы просто пропускаем)
+            if current_street in pots:
+                pots[current_street] = current_pot
+            current_street = street
             committed = {}
 
-        act.pot_before = current_pot
+        kind = act.action
+        amount = act.amount
+        pot_before = current_pot
 
-        if act.action in ("post_sb", "post_bb", "bet", "call"):
-            if act.amount is not None:
-                current_pot += act.amount
-                committed[act.player] = committed.get(act.player, 0.0) + act.amount
+        if amount is not None:
+            if kind in _POT_ADDING_ACTIONS:
+                current_pot += amount
+                committed[act.player] = committed.get(act.player, 0.0) + amount
 
-        elif act.action == "raise":
-            if act.amount is not None:
-                prev = committed.get(act.player, 0.0)
-                delta = act.amount - prev
+            elif kind == "raise":
+                delta = amount - committed.get(act.player, 0.0)
                 if delta < 0:
                     delta = 0.0
                 current_pot += delta
-                committed[act.player] = act.amount
+                committed[act.player] = amount
 
-        elif act.action == "uncalled":
-            if act.amount is not None:
-                current_pot -= act.amount
-
-        act.pot_after = current_pot
+            elif kind == "uncalled":
+                current_pot -= amount
 
-        if big_blind and act.amount is not None and big_blind > 0:
-            act.amount_bb = act.amount / big_blind
+            act.amount_bb = amount / big_blind if bb_ok else None
+            act.pct_pot = amount / pot_before if pot_before and pot_before > 0 else None
         else:
             act.amount_bb = None
-
-        if act.amount is not None and act.pot_before and act.pot_before > 0:
-            act.pct_pot = act.amount / act.pot_before
-        else:
             act.pct_pot = None
 
-    fix_street(current_street, current_pot)
+        act.pot_before = pot_before
+        act.pot_after = current_pot
+
+    if current_street in pots:
+        pots[current_street] = current_pot
 
     return pots
 
@@ -715,24 +723,33 @@ def compute_hero_preflop_analysis(
     if not hero_name:
         return None
 
-    preflop_actions = [a for a in actions if a.street == "preflop"]
-    if not preflop_actions:
-        return HeroPreflopAnalysis(
-            action_type=None,
-            was_first_in=None,
-            facing_raises=0,
-            facing_callers=0,
-            villain_raiser=None,
-            hero_position=hero_position,
-            effective_stack_bb=effective_stack_bb,
-        )
-
-    hero_preflop_actions = [
-        a for a in preflop_actions
-        if a.player == hero_name and a.action not in ("uncalled", "post_sb", "post_bb")
-    ]
+    # Один проход по префлопу до первого добровольного действия героя:
+    # по пути считаем рейзы, коллы после последнего рейза и был ли вход до героя.
+    hero_first: Optional[Action] = None
+    was_first_in = True
+    facing_raises = 0
+    facing_callers = 0
+    villain_raiser: Optional[str] = None
 
-    if not hero_preflop_actions:
+    for a in actions:
+        if a.street != "preflop":
+            continue
+        kind = a.action
+        if a.player == hero_name and kind not in _SKIP_ACTIONS:
+            hero_first = a
+            break
+        if kind == "raise":
+            facing_raises += 1
+            villain_raiser = a.player
+            facing_callers = 0
+            was_first_in = False
+        elif kind == "call":
+            facing_callers += 1
+            was_first_in = False
+        elif kind == "bet":
+            was_first_in = False
+
+    if hero_first is None:
         return HeroPreflopAnalysis(
             action_type=None,
             was_first_in=None,
@@ -743,27 +760,6 @@ def compute_hero_preflop_analysis(
             effective_stack_bb=effective_stack_bb,
         )
 
-    hero_first = hero_preflop_actions[0]
-    idx_hero = preflop_actions.index(hero_first)
-    prior = preflop_actions[:idx_hero]
-
-    prior_voluntary = [a for a in prior if a.action in ("bet", "raise", "call")]
-    was_first_in = len(prior_voluntary) == 0
-
-    prior_raises = [a for a in prior if a.action == "raise"]
-    facing_raises = len(prior_raises)
-    villain_raiser = prior_raises[-1].player if prior_raises else None
-
-    if prior_raises:
-        last_raise_idx = max(i for i, a in enumerate(prior) if a.action == "raise")
-        facing_callers = sum(
-            1
-            for i, a in enumerate(prior)
-            if i > last_raise_idx and a.action == "call"
-        )
-    else:
-        facing_callers = sum(1 for a in prior if a.action == "call")
-
     act_type = "unknown"
 
     if hero_first.action == "fold":
@@ -820,7 +816,7 @@ def compute_hero_preflop_decision(
 
     hero_preflop_actions = [
         a for a in preflop_actions
-        if a.player == hero_name and a.action not in ("uncalled", "post_sb", "post_bb")
+        if a.player == hero_name and a.action not in _SKIP_ACTIONS
     ]
     if not hero_preflop_actions:
         return None
@@ -832,7 +828,7 @@ def compute_hero_preflop_decision(
 
     action_type = hero_preflop_analysis.action_type
 
-    if hero_first.action in ("call", "raise", "fold", "check", "bet"):
+    if hero_first.action in _DECISION_ACTION_KINDS:
         action_kind = hero_first.action
     else:
         action_kind = "other"
@@ -896,36 +892,37 @@ def compute_hero_preflop_followup(
     if not preflop_actions:
         return None
 
-    # Все добровольные действия героя на префлопе
+    # Все добровольные действия героя на префлопе — сразу с индексом в preflop_actions
     hero_preflop_actions = [
-        a for a in preflop_actions
-        if a.player == hero_name and a.action not in ("uncalled", "post_sb", "post_bb")
+        (i, a) for i, a in enumerate(preflop_actions)
+        if a.player == hero_name and a.action not in _SKIP_ACTIONS
     ]
     # Нас интересуют только случаи, где герой делал КАК МИНИМУМ два действия
     # (например: 3-бет -> фолд vs 4-бет).
     if len(hero_preflop_actions) < 2:
         return None
 
-    hero_last = hero_preflop_actions[-1]
+    idx_last, hero_last = hero_preflop_actions[-1]
     if hero_last.action != "fold":
         # follow-up анализ пока делаем только для фолдов
         return None
 
-    # Индекс последнего действия героя в общем списке префлоп-экшенов
-    try:
-        idx_last = preflop_actions.index(hero_last)
-    except ValueError:
-        return None
-
-    prior = preflop_actions[:idx_last]
-
-    # Ищем последнее агрессивное действие соперника до фолда героя (бет/рейз)
-    last_agg_idx = None
+    # Один проход по действиям до фолда героя:
+    #  - последнее агрессивное действие соперника (бет/рейз);
+    #  - сколько каждый игрок уже вложил в банк;
+    #  - сколько было рейзов.
     last_agg = None
-    for i, a in enumerate(prior):
-        if a.action in ("bet", "raise"):
-            last_agg_idx = i
+    contributions: Dict[str, float] = {}
+    raises_before_hero = 0
+    for a in preflop_actions[:idx_last]:
+        kind = a.action
+        if kind == "raise":
+            last_agg = a
+            raises_before_hero += 1
+        elif kind == "bet":
             last_agg = a
+        if a.amount is not None:
+            contributions[a.player] = contributions.get(a.player, 0.0) + a.amount
 
     if last_agg is None:
         # Герой сфолдил без явной агрессии перед этим — неинтересно.
@@ -933,13 +930,6 @@ def compute_hero_preflop_followup(
 
     villain_name = last_agg.player
 
-    # Считаем, сколько каждый игрок уже вложил в банк к моменту фолда героя
-    contributions: Dict[str, float] = {}
-    for i, a in enumerate(prior):
-        if a.amount is None:
-            continue
-        contributions[a.player] = contributions.get(a.player, 0.0) + a.amount
-
     hero_invested = contributions.get(hero_name, 0.0)
     villain_invested = contributions.get(villain_name, 0.0)
 
@@ -967,8 +957,7 @@ def compute_hero_preflop_followup(
 
     # Классифицируем тип ситуации
     # (fold после уже вложенного рейза, например 3-бет/4-бет-пот).
-    raises_before_hero = [a for a in prior if a.action == "raise"]
-    if len(raises_before_hero) >= 2:
+    if raises_before_hero >= 2:
         action_type = "fold_vs_3bet_plus"
     else:
         action_type = "fold_vs_aggression"
@@ -1351,7 +1340,7 @@ def compute_hero_flop_decision(
     idx_first = flop_actions.index(first)
     prior = flop_actions[:idx_first]
 
-    facing_bet = any(a.action in ("bet", "raise") for a in prior)
+    facing_bet = any(a.action in _AGGRESSIVE_ACTIONS for a in prior)
 
     # Определяем роль префлоп
     preflop_role = "unknown"
@@ -1547,7 +1536,7 @@ def compute_hero_flop_decision(
     if first.pct_pot is not None:
         pct_str = f"{first.pct_pot * 100:.1f}%"
     size_part = ""
-    if first.action in ("bet", "raise") and first.amount is not None and first.pot_before is not None:
+    if first.action in _AGGRESSIVE_ACTIONS and first.amount is not None and first.pot_before is not None:
         size_part = f" Размер ставки: {first.amount:.2f} в пот {first.pot_before:.2f}"
         if pct_str:
             size_part += f" (~{pct_str} пота)."
@@ -1647,175 +1636,185 @@ def compute_hero_flop_decision(
 # ---------------------------------------------------------------------
 
 
-def parse_file_to_hands(path: str | Path) -> List[Dict[str, Any]]:
-    hand_texts = load_and_split(path)
-    hands_objects: List[Hand] = []
-
-    for idx, hand_text in enumerate(hand_texts, start=1):
-        (
-            hand_id,
-            game_type,
-            currency,
-            sb,
-            bb,
-            date,
-            time,
-            table_name,
-            max_players,
-            button_seat,
-        ) = parse_hand_header(hand_text)
-
-        players = parse_players(hand_text)
-        players = assign_positions(players, button_seat, max_players)
-
-        hero_name, hero_cards = parse_hero(hand_text)
-
-        hero_position: Optional[str] = None
-        hero_stack_bb: Optional[float] = None
-        if hero_name is not None and bb and bb > 0:
-            for p in players:
-                if p.name == hero_name:
-                    hero_position = p.position
-                    hero_stack_bb = p.stack / bb
-                    break
-
-        effective_stack_bb = compute_effective_stack_bb(players, hero_name, bb)
-
-        actions = parse_actions(hand_text)
-        board = parse_board(hand_text)
-        total_pot, rake = parse_total_pot_and_rake(hand_text)
-        winners = parse_winners(hand_text)
-        showdown = parse_showdown(hand_text)
-
-        pots = annotate_actions_with_pot_and_bb(actions, bb)
-
-        hero_preflop_analysis = compute_hero_preflop_analysis(
-            actions=actions,
-            players=players,
-            hero_name=hero_name,
-            hero_position=hero_position,
-            effective_stack_bb=effective_stack_bb,
-        )
-
-        villain_position: Optional[str] = None
-        if hero_preflop_analysis and hero_preflop_analysis.villain_raiser:
-            vr_name = hero_preflop_analysis.villain_raiser
-            for p in players:
-                if p.name == vr_name:
-                    villain_position = p.position
-                    break
-
-        hero_preflop_equity: Optional[Dict[str, Any]] = None
-        if hero_cards:
-            hero_preflop_equity = estimate_preflop_equity_as_dict(
-                hero_cards=hero_cards,
-                hero_position=hero_position,
-                villain_position=villain_position,
-            )
-
-        hero_preflop_decision: Optional[Dict[str, Any]] = None
-        if hero_preflop_analysis and hero_preflop_equity:
-            hero_preflop_decision = compute_hero_preflop_decision(
-                actions=actions,
-                hero_name=hero_name,
-                hero_preflop_analysis=hero_preflop_analysis,
-                hero_preflop_equity=hero_preflop_equity,
-            )
+def _parse_hand(idx: int, hand_text: str) -> Hand:
+    """Полный разбор одной раздачи; раздачи друг от друга не зависят."""
+    # строки раздачи режем один раз и отдаём построчным парсерам
+    lines = hand_text.splitlines()
 
-        # --- Флоп / Тёрн / Ривер-анализ ---
-        hero_flop_hand_category: Optional[str] = None
-        hero_flop_hand_detail: Optional[Dict[str, Any]] = None
-        hero_flop_decision: Optional[Dict[str, Any]] = None
-        hero_turn_decision: Optional[Dict[str, Any]] = None
-        hero_river_decision: Optional[Dict[str, Any]] = None
-
-        hero_has_flop_action = False
-        if hero_name is not None:
-            hero_has_flop_action = any(
-                a.street == "flop" and a.player == hero_name
-                for a in actions
-            )
+    (
+        hand_id,
+        game_type,
+        currency,
+        sb,
+        bb,
+        date,
+        time,
+        table_name,
+        max_players,
+        button_seat,
+    ) = parse_hand_header(hand_text, lines)
+
+    players = parse_players(hand_text, lines)
+    players = assign_positions(players, button_seat, max_players)
+
+    hero_name, hero_cards = parse_hero(hand_text)
+
+    hero_position: Optional[str] = None
+    hero_stack_bb: Optional[float] = None
+    if hero_name is not None and bb and bb > 0:
+        for p in players:
+            if p.name == hero_name:
+                hero_position = p.position
+                hero_stack_bb = p.stack / bb
+                break
+
+    effective_stack_bb = compute_effective_stack_bb(players, hero_name, bb)
+
+    actions = parse_actions(hand_text, lines)
+    board = parse_board(hand_text)
+    total_pot, rake = parse_total_pot_and_rake(hand_text)
+    winners = parse_winners(hand_text)
+    showdown = parse_showdown(hand_text)
+
+    pots = annotate_actions_with_pot_and_bb(actions, bb)
+
+    hero_preflop_analysis = compute_hero_preflop_analysis(
+        actions=actions,
+        players=players,
+        hero_name=hero_name,
+        hero_position=hero_position,
+        effective_stack_bb=effective_stack_bb,
+    )
 
-        if hero_has_flop_action:
-            hero_flop_hand_category = evaluate_flop_hand_category(
-                hero_cards=hero_cards,
-                board=board,
-            )
-            hero_flop_hand_detail = compute_hero_flop_detail(
-                hero_cards=hero_cards,
-                board=board,
-                hero_flop_hand_category=hero_flop_hand_category,
-            )
-            hero_flop_decision = compute_hero_flop_decision(
-                actions=actions,
-                hero_name=hero_name,
-                hero_position=hero_position,
-                hero_preflop_analysis=hero_preflop_analysis,
-                hero_flop_hand_category=hero_flop_hand_category,
-                hero_flop_hand_detail=hero_flop_hand_detail,
-            )
+    villain_position: Optional[str] = None
+    if hero_preflop_analysis and hero_preflop_analysis.villain_raiser:
+        vr_name = hero_preflop_analysis.villain_raiser
+        for p in players:
+            if p.name == vr_name:
+                villain_position = p.position
+                break
+
+    hero_preflop_equity: Optional[Dict[str, Any]] = None
+    if hero_cards:
+        hero_preflop_equity = estimate_preflop_equity_as_dict(
+            hero_cards=hero_cards,
+            hero_position=hero_position,
+            villain_position=villain_position,
+        )
 
-            hero_turn_decision = evaluate_hero_turn_decision(
-                actions=actions,
-                hero_name=hero_name,
-                hero_position=hero_position,
-                hero_preflop_analysis=hero_preflop_analysis,
-                hero_flop_decision=hero_flop_decision,
-                board=board,
-                hero_flop_hand_category=hero_flop_hand_category,
-            )
+    hero_preflop_decision: Optional[Dict[str, Any]] = None
+    if hero_preflop_analysis and hero_preflop_equity:
+        hero_preflop_decision = compute_hero_preflop_decision(
+            actions=actions,
+            hero_name=hero_name,
+            hero_preflop_analysis=hero_preflop_analysis,
+            hero_preflop_equity=hero_preflop_equity,
+        )
 
-            hero_river_decision = evaluate_hero_river_decision(
-                actions=actions,
-                hero_name=hero_name,
-                hero_position=hero_position,
-                hero_preflop_analysis=hero_preflop_analysis,
-                hero_flop_decision=hero_flop_decision,
-                hero_turn_decision=hero_turn_decision,
-                board=board,
-            )
+    # --- Флоп / Тёрн / Ривер-анализ ---
+    hero_flop_hand_category: Optional[str] = None
+    hero_flop_hand_detail: Optional[Dict[str, Any]] = None
+    hero_flop_decision: Optional[Dict[str, Any]] = None
+    hero_turn_decision: Optional[Dict[str, Any]] = None
+    hero_river_decision: Optional[Dict[str, Any]] = None
+
+    hero_has_flop_action = False
+    if hero_name is not None:
+        hero_has_flop_action = any(
+            a.street == "flop" and a.player == hero_name
+            for a in actions
+        )
 
-        hand = Hand(
-            id=idx,
-            hand_id=hand_id,
-            game_type=game_type,
-            currency=currency,
-            small_blind=sb,
-            big_blind=bb,
-            date=date,
-            time=time,
-            table_name=table_name,
-            max_players=max_players,
-            button_seat=button_seat,
-            players=players,
-            hero_name=hero_name,
+    if hero_has_flop_action:
+        hero_flop_hand_category = evaluate_flop_hand_category(
             hero_cards=hero_cards,
+            board=board,
+        )
+        hero_flop_hand_detail = compute_hero_flop_detail(
+            hero_cards=hero_cards,
+            board=board,
+            hero_flop_hand_category=hero_flop_hand_category,
+        )
+        hero_flop_decision = compute_hero_flop_decision(
+            actions=actions,
+            hero_name=hero_name,
             hero_position=hero_position,
-            hero_stack_bb=hero_stack_bb,
             hero_preflop_analysis=hero_preflop_analysis,
-            hero_preflop_equity=hero_preflop_equity,
-            hero_preflop_decision=hero_preflop_decision,
             hero_flop_hand_category=hero_flop_hand_category,
             hero_flop_hand_detail=hero_flop_hand_detail,
+        )
+
+        hero_turn_decision = evaluate_hero_turn_decision(
+            actions=actions,
+            hero_name=hero_name,
+            hero_position=hero_position,
+            hero_preflop_analysis=hero_preflop_analysis,
             hero_flop_decision=hero_flop_decision,
-            hero_turn_decision=hero_turn_decision,
-            hero_river_decision=hero_river_decision,
+            board=board,
+            hero_flop_hand_category=hero_flop_hand_category,
+        )
+
+        hero_river_decision = evaluate_hero_river_decision(
             actions=actions,
+            hero_name=hero_name,
+            hero_position=hero_position,
+            hero_preflop_analysis=hero_preflop_analysis,
+            hero_flop_decision=hero_flop_decision,
+            hero_turn_decision=hero_turn_decision,
             board=board,
-            pot_preflop=pots["preflop"],
-            pot_flop=pots["flop"],
-            pot_turn=pots["turn"],
-            pot_river=pots["river"],
-            total_pot=total_pot,
-            rake=rake,
-            winners=winners,
-            showdown=showdown,
-            raw_text=hand_text,
         )
 
-        hands_objects.append(hand)
+    return Hand(
+        id=idx,
+        hand_id=hand_id,
+        game_type=game_type,
+        currency=currency,
+        small_blind=sb,
+        big_blind=bb,
+        date=date,
+        time=time,
+        table_name=table_name,
+        max_players=max_players,
+        button_seat=button_seat,
+        players=players,
+        hero_name=hero_name,
+        hero_cards=hero_cards,
+        hero_position=hero_position,
+        hero_stack_bb=hero_stack_bb,
+        hero_preflop_analysis=hero_preflop_analysis,
+        hero_preflop_equity=hero_preflop_equity,
+        hero_preflop_decision=hero_preflop_decision,
+        hero_flop_hand_category=hero_flop_hand_category,
+        hero_flop_hand_detail=hero_flop_hand_detail,
+        hero_flop_decision=hero_flop_decision,
+        hero_turn_decision=hero_turn_decision,
+        hero_river_decision=hero_river_decision,
+        actions=actions,
+        board=board,
+        pot_preflop=pots["preflop"],
+        pot_flop=pots["flop"],
+        pot_turn=pots["turn"],
+        pot_river=pots["river"],
+        total_pot=total_pot,
+        rake=rake,
+        winners=winners,
+        showdown=showdown,
+        raw_text=hand_text,
+    )
+
 
-    return [asdict(hand) for hand in hands_objects]
+def parse_text_to_hands(text: str) -> List[Dict[str, Any]]:
+    return [
+        asdict(_parse_hand(idx, hand_text))
+        for idx, hand_text in enumerate(split_into_hands(text), start=1)
+    ]
+
+
+def parse_file_to_hands(path: str | Path) -> List[Dict[str, Any]]:
+    return [
+        asdict(_parse_hand(idx, hand_text))
+        for idx, hand_text in enumerate(iter_hands(path), start=1)
+    ]
 
 
 def parse_file_to_json_string(path: str | Path) -> str:
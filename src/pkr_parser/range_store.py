@@ -3,7 +3,8 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set
 
 MOSPosition = str
 
@@ -102,13 +103,32 @@ def get_mos_rfi_pack() -> RangePack:
     return _CACHED_PACK
 
 
+def _build_mos_index(pack: RangePack) -> Mapping[str, MOSPosition]:
+    """
+    hand_key -> минимальная MOS-позиция.
+    Идём по позициям с конца, чтобы более ранняя позиция перезаписала позднюю
+    (рука из EP, продублированная в MP/HJ, остаётся EP).
+    """
+    index: Dict[str, MOSPosition] = {}
+    for pos in reversed(pack.order):
+        for hk in pack.rfi.get(pos, ()):
+            index[hk] = pos
+    return MappingProxyType(index)
+
+
+# Индекс строится один раз вместе с паком: поиск — один dict.get вместо обхода 4 множеств
+_CACHED_MOS_INDEX: Optional[Mapping[str, MOSPosition]] = None
+
+
+def get_mos_index() -> Mapping[str, MOSPosition]:
+    global _CACHED_MOS_INDEX
+    if _CACHED_MOS_INDEX is None:
+        _CACHED_MOS_INDEX = _build_mos_index(get_mos_rfi_pack())
+    return _CACHED_MOS_INDEX
+
+
 def mos_min_position(hand_key: str) -> Optional[str]:
     """
     Возвращает минимальную MOS-позицию (EP/MP/HJ/CO) для hand_key по JSON-диапазонам.
     """
-    hk = _normalize_hand_key(hand_key)
-    pack = get_mos_rfi_pack()
-    for pos in pack.order:
-        if hk in pack.rfi.get(pos, set()):
-            return pos
-    return None
+    return get_mos_index().get(_normalize_hand_key(hand_key))
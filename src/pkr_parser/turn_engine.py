@@ -39,11 +39,13 @@ def _get(a: Any, key: str, default: Any = None) -> Any:
 
 
 def _safe_float(x: Any) -> Optional[float]:
+    if type(x) is float:
+        return x
+    if x is None:
+        return None
     try:
-        if x is None:
-            return None
         return float(x)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return None
 
 